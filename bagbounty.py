@@ -15,74 +15,52 @@ import time
 # Добавляем src в путь
 sys.path.append(str(Path(__file__).parent / "src"))
 
-from src.utils.common import print_status, print_success, print_error, print_warning, time_tracker, run_command_with_activity_monitor
+from src.utils.common import print_status, print_success, print_error, print_warning, time_tracker, run_command_with_activity_monitor, StageError
 from src.utils.reports_manager import setup_reports_for_domain, ReportsManager
 from src.utils.debug_logger import init_debug_logger, get_debug_logger
+from src.recon import recon
+from src.filter import filter_recon
+from src.analyze import analyze
+from src.scanner import vuln_scanner
+from src.utils.url_store import UrlStore, FILTERED_TAG, FILTER_DONE
 
-def run_step(command, step_name, cwd=None, debug_logger=None, timeout=300):
-    """Выполняет этап и обрабатывает ошибки"""
+def run_stage(func, step_name, *args, debug_logger=None, **kwargs):
+    """
+    Выполняет этап в текущем процессе и обрабатывает ошибки.
+    Возвращает результат этапа или None, если этап завершился с ошибкой.
+    """
     time_tracker.start_stage(step_name)
     
     if debug_logger:
-        process_id = debug_logger.command_start(command, timeout)
+        debug_logger.info(f"Начало этапа: {step_name}")
     
     try:
-        result = subprocess.run(
-            command, 
-            shell=True, 
-            check=True, 
-            capture_output=True, 
-            text=True,
-            cwd=cwd,
-            timeout=timeout
-        )
-        time_tracker.end_stage(step_name)
+        result = func(*args, **kwargs)
         
         if debug_logger:
-            debug_logger.command_end(process_id, success=True, output=result.stdout)
+            debug_logger.info(f"Этап завершен: {step_name}")
         
-        if result.stdout:
-            print(result.stdout)
-        return True
+        return result
         
-    except subprocess.TimeoutExpired as e:
-        time_tracker.end_stage(step_name)
-        error_msg = f"Таймаут на этапе: {step_name} (>{timeout}с)"
-        print_error(error_msg)
+    except StageError as e:
+        print_error(f"Ошибка на этапе: {step_name}: {e}")
         
         if debug_logger:
-            debug_logger.command_end(process_id, success=False, error=f"Таймаут: {timeout}с")
-            debug_logger.warning(f"Команда зависла: {command}")
+            debug_logger.error(f"Ошибка на этапе {step_name}: {e}")
         
-        return False
-        
-    except subprocess.CalledProcessError as e:
-        time_tracker.end_stage(step_name)
-        print_error(f"Ошибка на этапе: {step_name}")
-        
-        if debug_logger:
-            debug_logger.command_end(process_id, success=False, error=str(e))
-            if e.stdout:
-                debug_logger.debug(f"STDOUT: {e.stdout}")
-            if e.stderr:
-                debug_logger.error(f"STDERR: {e.stderr}")
-        
-        if e.stdout:
-            print(f"STDOUT: {e.stdout}")
-        if e.stderr:
-            print(f"STDERR: {e.stderr}")
-        return False
+        return None
         
     except Exception as e:
-        time_tracker.end_stage(step_name)
         error_msg = f"Неожиданная ошибка в {step_name}: {e}"
         print_error(error_msg)
         
         if debug_logger:
-            debug_logger.command_end(process_id, success=False, error=str(e))
             debug_logger.log_exception(e, f"в этапе {step_name}")
         
-        return False
+        return None
+        
+    finally:
+        time_tracker.end_stage(step_name)
 
 def check_dependencies(debug_logger=None):
     """Проверяет наличие основных зависимостей"""
@@ -129,6 +107,27 @@ def check_dependencies(debug_logger=None):
     time_tracker.end_stage("Проверка зависимостей")
     return True
 
+def finish_incremental_state(recon_result, success, debug_logger=None):
+    """
+    Сохраняет состояние инкрементальной разведки, если URL запуска обработаны всеми
+    запрошенными этапами, и закрывает его. При ошибке этапа новые URL не считаются
+    известными и будут обработаны в следующем запуске.
+    """
+    state = recon_result.get('state') if recon_result else None
+    if state is None:
+        return
+    try:
+        if success:
+            state.commit()
+            print_status("Состояние инкрементальной разведки сохранено")
+        else:
+            print_warning("Состояние инкрементальной разведки не сохранено: новые URL будут обработаны в следующем запуске")
+            
+            if debug_logger:
+                debug_logger.warning("Состояние инкрементальной разведки не сохранено")
+    finally:
+        state.close()
+
 def run_step_with_activity_monitor(command, step_name, cwd=None, debug_logger=None, timeout=300, activity_timeout=60):
     """Выполняет этап с мониторингом активности"""
     time_tracker.start_stage(step_name)
@@ -159,12 +158,17 @@ def main():
   %(prog)s example.com --recon-only       # Только разведка
   %(prog)s example.com --skip-scan        # Без активного сканирования
   %(prog)s example.com --threads 5        # С ограничением потоков
+  %(prog)s example.com --workers 8        # Фильтрация и анализ URL на 8 процессах
+  %(prog)s example.com --keep-per-shape 3 # Не более 3 URL одной формы
+  %(prog)s example.com --stream           # Потоковая разведка subfinder -> httpx -> katana
+  %(prog)s example.com --incremental      # Только новое с прошлого запуска
+  %(prog)s example.com --no-cache         # Не использовать кеш subfinder, waybackurls и httpx
   %(prog)s example.com --reports-dir /path/to/reports  # Указать папку для отчетов
   
 Опции отладки:
   %(prog)s example.com --debug            # Включить отладку
   %(prog)s example.com --log-file logs/debug.log  # Сохранить логи в файл
-  %(prog)s example.com --timeout 600      # Увеличить таймаут до 10 минут
+  %(prog)s example.com --timeout 600      # Таймаут команд разведки и лимит сканирования 10 минут
   %(prog)s example.com --activity-timeout 120  # Таймаут неактивности 2 минуты
   %(prog)s example.com --monitor-hanging  # Мониторинг зависших процессов
   %(prog)s example.com --verbose          # Подробный вывод
@@ -175,6 +179,14 @@ def main():
     parser.add_argument('--recon-only', action='store_true', help='Только разведка')
     parser.add_argument('--skip-scan', action='store_true', help='Пропустить активное сканирование')
     parser.add_argument('--threads', type=int, default=3, help='Количество потоков (по умолчанию: 3)')
+    parser.add_argument('--workers', type=int, default=1, help='Количество процессов для обработки URL (по умолчанию: 1)')
+    parser.add_argument('--keep-per-shape', type=int,
+                        help='Оставлять не более K URL одной формы (/product/{int}?id) для сканирования')
+    parser.add_argument('--stream', action='store_true', help='Потоковая разведка без ожидания промежуточных файлов')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Обрабатывать только новые поддомены и URL с прошлого запуска')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Не использовать кеш результатов subfinder, waybackurls и httpx')
     parser.add_argument('--output-dir', help='Директория для результатов')
     parser.add_argument('--reports-dir', help='Директория для отчетов (по умолчанию: reports/)')
     parser.add_argument('--check-deps', action='store_true', help='Проверить зависимости и выйти')
@@ -185,7 +197,9 @@ def main():
     # Новые опции отладки
     parser.add_argument('--debug', action='store_true', help='Включить режим отладки')
     parser.add_argument('--log-file', help='Файл для сохранения логов отладки')
-    parser.add_argument('--timeout', type=int, default=300, help='Таймаут для команд в секундах (по умолчанию: 300)')
+    parser.add_argument('--timeout', type=int, default=300,
+                        help='Таймаут для команд разведки и общий лимит времени активного сканирования в секундах; '
+                             'фильтрация и анализ обрабатывают локальные файлы и не ограничиваются (по умолчанию: 300)')
     parser.add_argument('--activity-timeout', type=int, default=60, help='Таймаут неактивности в секундах (по умолчанию: 60)')
     parser.add_argument('--monitor-hanging', action='store_true', help='Мониторинг зависших процессов')
     parser.add_argument('--verbose', action='store_true', help='Подробный вывод')
@@ -274,7 +288,6 @@ def main():
     
     # Настройка путей
     recon_out = f"recon-{args.domain}"
-    all_urls_file = f"{recon_out}/urls/all_urls.txt"
     filtered_out = f"filtered-{args.domain}.txt"
     
     # Создание директории для результатов если указана
@@ -302,8 +315,11 @@ def main():
         debug_logger.info("Запущен мониторинг зависших процессов")
     
     # 1. Разведка
-    if not run_step(f"python3 src/recon/recon.py {args.domain}", "Разведка домена", 
-                   debug_logger=debug_logger, timeout=args.timeout):
+    recon_result = run_stage(recon.run, "Разведка домена", args.domain,
+                             reports_dir=args.reports_dir, activity_timeout=args.activity_timeout,
+                             timeout=args.timeout, stream=args.stream, incremental=args.incremental,
+                             use_cache=not args.no_cache, commit_state=False, debug_logger=debug_logger)
+    if recon_result is None:
         print_error("Разведка завершилась с ошибкой")
         
         if debug_logger:
@@ -322,6 +338,8 @@ def main():
         if debug_logger:
             debug_logger.info("Завершение в режиме 'только разведка'")
         
+        finish_incremental_state(recon_result, True, debug_logger)
+        
         # Организуем отчеты разведки
         time_tracker.start_stage("Организация отчетов")
         reports_manager.move_existing_reports(args.domain)
@@ -341,14 +359,58 @@ def main():
         
         return
     
+    # В инкрементальном режиме без новых URL фильтровать и сканировать нечего
+    if args.incremental and recon_result['new']['urls'] == 0:
+        print_success("Новых URL с прошлого запуска нет - фильтрация, анализ и сканирование пропущены")
+        
+        if debug_logger:
+            debug_logger.info("Новых URL нет, завершение")
+        
+        finish_incremental_state(recon_result, True, debug_logger)
+        
+        time_tracker.start_stage("Организация отчетов")
+        reports_manager.move_existing_reports(args.domain)
+        time_tracker.end_stage("Организация отчетов")
+        
+        if args.show_summary:
+            reports_manager.print_summary()
+        
+        if args.show_timing:
+            time_tracker.print_summary()
+        
+        time_tracker.end_total()
+        
+        if debug_logger:
+            debug_logger.print_summary()
+        
+        return
+    
     # 2. Фильтрация
-    if not run_step(f"python3 src/filter/filter_recon.py {all_urls_file}", "Фильтрация результатов",
-                   debug_logger=debug_logger, timeout=args.timeout):
+    all_urls_file = recon_result['files']['all_urls']
+    
+    url_store_file = recon_result['files']['url_store']
+    
+    def filter_stage():
+        with open(filtered_out, 'w', encoding='utf-8') as output_file:
+            result = filter_recon.clean_url_file(all_urls_file, output_file,
+                                                 filter_recon.default_args(workers=args.workers,
+                                                                           keep_per_shape=args.keep_per_shape))
+        # Прошедшие фильтр URL помечаются в хранилище URL запуска для сканера
+        with UrlStore(url_store_file) as store, open(filtered_out, 'r', encoding='utf-8') as filtered:
+            store.add_tags(FILTERED_TAG, (line.rstrip('\n') for line in filtered))
+            # Отметка отличает "фильтр ничего не оставил" от "фильтрации не было"
+            store.set_meta(FILTER_DONE)
+        return result
+    
+    filter_result = run_stage(filter_stage, "Фильтрация результатов", debug_logger=debug_logger)
+    if filter_result is None:
         print_error("Фильтрация завершилась с ошибкой")
         
         if debug_logger:
             debug_logger.error("Фильтрация завершилась с ошибкой")
         
+        finish_incremental_state(recon_result, False, debug_logger)
+        
         time_tracker.end_total()
         
         if debug_logger:
@@ -356,24 +418,36 @@ def main():
         
         return
     
+    print_status(f"Уникальных URL после фильтрации: {filter_result['unique']}")
+    
     # 3. Анализ
-    if not run_step(f"python3 src/analyze/analyze.py {args.domain}", "Анализ URL на уязвимости",
-                   debug_logger=debug_logger, timeout=args.timeout):
+    analyze_result = run_stage(analyze.run, "Анализ URL на уязвимости", args.domain,
+                               recon_dir=recon_out, workers=args.workers, debug_logger=debug_logger)
+    if analyze_result is None:
         print_warning("Анализ завершился с ошибкой, продолжаем...")
         
         if debug_logger:
             debug_logger.warning("Анализ завершился с ошибкой, продолжаем")
     
     # 4. Активное сканирование (если не пропущено)
+    scan_result = None
     if not args.skip_scan:
-        scan_cmd = f"python3 src/scanner/vuln_scanner.py {recon_out} --threads {args.threads}"
-        if not run_step(scan_cmd, "Активное сканирование уязвимостей",
-                       debug_logger=debug_logger, timeout=args.timeout):
+        # nuclei получает отфильтрованный список URL вместо полного
+        scan_result = run_stage(vuln_scanner.run, "Активное сканирование уязвимостей", recon_out,
+                                urls=os.path.abspath(filtered_out), threads=args.threads,
+                                keep_per_shape=args.keep_per_shape, timeout=args.timeout,
+                                debug_logger=debug_logger)
+        if scan_result is None:
             print_warning("Активное сканирование завершилось с ошибкой")
             
             if debug_logger:
                 debug_logger.warning("Активное сканирование завершилось с ошибкой")
     
+    # Состояние сохраняется, только если новые URL прошли все запрошенные этапы
+    finish_incremental_state(recon_result,
+                             analyze_result is not None and (args.skip_scan or scan_result is not None),
+                             debug_logger)
+    
     # Организуем все отчеты
     time_tracker.start_stage("Организация отчетов")
     print_status("Организация отчетов...")
@@ -391,16 +465,11 @@ def main():
         debug_logger.info("Все этапы завершены успешно")
     
     # Показываем статистику
-    try:
-        with open(f"{recon_out}/urls/all_urls.txt", 'r') as f:
-            urls_count = sum(1 for _ in f)
-        print_status(f"Всего URL: {urls_count}")
-        
-        if debug_logger:
-            debug_logger.info(f"Найдено URL: {urls_count}")
-    except Exception as e:
-        if debug_logger:
-            debug_logger.warning(f"Не удалось подсчитать URL: {e}")
+    urls_count = recon_result['counts']['urls']
+    print_status(f"{'Новых' if args.incremental else 'Всего'} URL: {urls_count}")
+    
+    if debug_logger:
+        debug_logger.info(f"Найдено URL: {urls_count}")
     
     # Показываем сводку отчетов если запрошено
     if args.show_summary:
@@ -24,14 +24,118 @@ TOOLS = {
 PORTS = "80,443,8080,8000,8888"
 THREADS = 200
 KATANA_DEPTH = 5
+RECON_STAGE_WORKERS = 4  # Сколько независимых этапов разведки выполнять одновременно
+STREAM_QUEUE_SIZE = 1000  # Размер очередей между этапами в потоковом режиме
+STREAM_KATANA_WORKERS = 5  # Количество параллельных обходчиков katana в потоковом режиме
 BLACKLIST_EXT = "woff,css,png,svg,jpg,woff2,jpeg,gif"
 SENSITIVE_EXT = r"\.(xls|xml|xlsx|json|pdf|sql|doc|docx|pptx|txt|zip|tar\.gz|tgz|bak|7z|rar|log|cache|secret|db|backup|yml|gz|config|csv|yaml|md|md5)$"
 
-# Паттерны для поиска секретов
+# Категории URL, выделяемые на этапе обработки URL (файл -> регулярное выражение)
+URL_CATEGORIES = {
+    'sensitive_files.txt': SENSITIVE_EXT,
+    'js_files.txt': r"js$",
+    'php_files.txt': r"php$",
+    'api_endpoints.txt': r"/api/"
+}
+# Файл с URL, обрезанными после первого '=' (уникальные шаблоны запросов с параметрами)
+PARAM_URLS_FILE = 'param_urls.txt'
+# Хранилище URL запуска (SQLite), общее для разведки, фильтрации, анализа и сканирования
+URL_STORE_FILE = 'urls.db'
+URL_STORE_CACHE_MB = 256  # Кеш страниц SQLite хранилища URL
+
+# Скачивание файлов (js, sensitive, php) на этапе разведки
+DOWNLOAD_CONFIG = {
+    'max_connections': 50,  # Общий лимит одновременных запросов
+    'max_per_host': 6,  # Лимит одновременных запросов к одному хосту
+    'timeout': 10,  # Таймаут подключения и чтения в секундах
+    'max_size_mb': 20,  # Файлы больше этого размера не скачиваются
+}
+
+# Проверка параметров URL ручными payloads на этапе сканирования
+PAYLOAD_CONFIG = {
+    'max_connections': 50,  # Общий лимит одновременных запросов
+    'max_per_host': 6,  # Лимит одновременных запросов к одному хосту
+    'timeout': 10,  # Таймаут подключения и чтения в секундах
+    'payloads_per_type': 3,  # Сколько payloads каждого типа подставлять в параметр
+    'capture_bytes': 65536,  # Сколько байт тела ответа проверять на отражение и сигнатуры
+    'snippet_bytes': 200,  # Размер фрагмента тела в результатах
+}
+
+# Ограничение частоты запросов к одному хосту на этапе сканирования (sqlmap, nuclei, payloads)
+RATE_LIMIT_CONFIG = {
+    'rate': 5,  # Начальная скорость, запросов в секунду на хост
+    'burst': 10,  # Сколько запросов можно отправить подряд без паузы
+    'min_rate': 0.2,  # Нижняя граница скорости после ответов 429/503
+    'max_rate': 20,  # Верхняя граница скорости
+    'backoff': 0.5,  # Множитель скорости на ответ 429/503
+    'increase': 0.1,  # Прибавка к скорости за каждый успешный ответ
+    'max_retry_after': 60,  # Предельная пауза по заголовку Retry-After в секундах
+    'retries': 2,  # Сколько раз повторять запрос после 429/503
+}
+
+# Оценка URL с параметрами для очереди сканирования
+SCAN_PRIORITY = {
+    'vuln_weights': {  # Признаки анализатора (параметры, характерные для типа уязвимости)
+        'rce': 8, 'sqli': 6, 'lfi': 5, 'ssrf': 5, 'xss': 3, 'open_redirect': 2,
+    },
+    'host_tag_weights': {  # Теги поддомена из анализа поддоменов
+        'admin': 4, 'internal': 4, 'dev': 3, 'jenkins': 3, 'database': 3, 'api': 2,
+        'monitoring': 2, 'cms': 1, 'wordpress': 1, 'cdn': -3,
+    },
+    'alive_bonus': 2,  # Хост ответил httpx при разведке
+    'not_alive_penalty': -5,  # Хост не ответил httpx (учитывается, если проверка была)
+    'dynamic_extensions': frozenset(('php', 'asp', 'aspx', 'jsp', 'jspx', 'do', 'action', 'cgi', 'pl')),
+    'dynamic_extension_bonus': 1,
+    'param_bonus': 0.5,  # За каждый параметр запроса
+    'max_param_bonus': 3,
+    'shape_repeat_penalty': 3,  # Понижение за каждый уже выбранный URL той же формы
+}
+
+# Бюджет тестирования URL с параметрами
+SCAN_BUDGET = {
+    'max_urls': 20,  # Сколько URL из начала очереди передается nuclei
+    'sqlmap_urls': 5,  # Сколько URL проверяется sqlmap (сначала URL с признаками sqli)
+    'payload_requests': 500,  # Сколько запросов может отправить ручное тестирование payloads
+    'payload_batch_urls': 5,  # Сколько URL ручного тестирования проверяется за один проход
+    'max_seconds': 1800,  # Общее время тестирования URL с параметрами
+}
+
+# Хранилище скачанных файлов по хешу содержимого (общее для всех запусков и доменов)
+BLOB_STORE_CONFIG = {
+    'dir': os.getenv('BAGBOUNTY_STORE_DIR', 'store'),
+}
+
+# Состояние инкрементальной разведки (известные поддомены, живые хосты и URL по доменам)
+STATE_CONFIG = {
+    'dir': os.getenv('BAGBOUNTY_STATE_DIR', 'state'),
+    'report_new_items': 50,  # Сколько новых значений каждого вида перечислять в отчете
+}
+
+# Кеш результатов внешних инструментов
+CACHE_CONFIG = {
+    'dir': os.getenv('BAGBOUNTY_CACHE_DIR', 'cache'),
+    'max_size_mb': 1024,  # При превышении вытесняются давно не использованные записи
+    'ttl': {  # Время жизни результатов в секундах
+        'subfinder': 24 * 3600,
+        'waybackurls': 7 * 24 * 3600,
+        'httpx': 6 * 3600,
+    },
+}
+
+# Дедупликация больших списков URL
+DEDUP_PARTITIONS = 64  # Количество разделов на диске при параллельной фильтрации URL
+FILTER_CHUNK_LINES = 100_000  # Размер блока строк для параллельной фильтрации URL
+DEDUP_BLOOM_CAPACITY = 10_000_000  # Ожидаемое число уникальных URL для фильтра Блума
+DEDUP_BLOOM_FP_RATE = 0.001  # Допустимая доля ложных срабатываний фильтра Блума
+
+# Анализ URL
+ANALYZE_CHUNK_LINES = 100_000  # Размер блока строк для параллельного анализа
+ANALYZE_SAMPLES = 10  # Сколько примеров каждой категории хранить в памяти для отчета
+
+# Паттерны для поиска секретов. Из пересекающихся совпадений остается совпадение паттерна,
+# который идет раньше, поэтому общие шаблоны идут последними
 SECRET_PATTERNS = {
-    'api_key': r'["\']?[a-zA-Z0-9_-]{32,45}["\']?',
     'aws_key': r'AKIA[0-9A-Z]{16}',
-    'aws_secret': r'[0-9a-zA-Z/+]{40}',
     'github_token': r'ghp_[a-zA-Z0-9]{36}',
     'google_api': r'AIza[0-9A-Za-z\-_]{35}',
     'firebase': r'AAAA[A-Za-z0-9_-]{7}:[A-Za-z0-9_-]{140}',
@@ -42,7 +146,20 @@ SECRET_PATTERNS = {
     'jwt_token': r'eyJ[A-Za-z0-9-_=]+\.[A-Za-z0-9-_=]+\.?[A-Za-z0-9-_.+/=]*',
     'password': r'["\']password["\']\s*[:=]\s*["\'][^"\']+["\']',
     'secret': r'["\']secret["\']\s*[:=]\s*["\'][^"\']+["\']',
-    'token': r'["\']token["\']\s*[:=]\s*["\'][^"\']+["\']'
+    'token': r'["\']token["\']\s*[:=]\s*["\'][^"\']+["\']',
+    'aws_secret': r'[0-9a-zA-Z/+]{40}',
+    'api_key': r'["\']?[a-zA-Z0-9_-]{32,45}["\']?'
+}
+
+# Поиск секретов по SECRET_PATTERNS
+SECRET_SCAN_CONFIG = {
+    'workers': os.cpu_count() or 1,  # Количество процессов
+    'index_file': os.path.join(BLOB_STORE_CONFIG['dir'], 'secrets.db'),  # Результаты по хешу содержимого
+    'min_entropy': {  # Совпадения общих шаблонов с меньшей энтропией (бит на символ) отбрасываются
+        'aws_secret': 4.0,
+        'api_key': 3.5,
+    },
+    'match_bytes': 200,  # Сколько байт совпадения сохранять в находке
 }
 
 # Payloads для тестирования
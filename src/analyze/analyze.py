@@ -1,187 +1,414 @@
 #!/usr/bin/env python3
 import os
 import re
+import sys
 import json
+import random
+import shutil
 import argparse
-from urllib.parse import urlparse, parse_qs
+import tempfile
+import multiprocessing
 from collections import defaultdict
 
-def analyze_urls(urls_file, output_dir):
-    """Анализирует URL на предмет потенциальных уязвимостей"""
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.line_reader import iter_lines
+from src.utils.url_store import UrlStore, store_path
+from config.settings import ANALYZE_CHUNK_LINES, ANALYZE_SAMPLES
+
+# Размер буфера файлов категорий
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Порядок категорий в отчете
+URL_REPORT_ORDER = ('sqli', 'xss', 'lfi', 'rce', 'ssrf', 'open_redirect', 'api_endpoints', 'sensitive_files')
+
+# Ключевые слова интересных поддоменов по тегам
+SUBDOMAIN_TAGS = {
+    'admin': ('admin',),
+    'api': ('api',),
+    'dev': ('dev', 'development', 'staging', 'test'),
+    'internal': ('internal', 'intranet', 'private'),
+    'cloud': ('cloud', 'aws', 'azure', 'gcp'),
+    'mobile': ('mobile', 'app', 'ios', 'android'),
+    'cdn': ('cdn', 'static', 'assets', 'media'),
+    'mail': ('mail', 'smtp', 'pop', 'imap'),
+    'database': ('db', 'database', 'mysql', 'postgres', 'mongo'),
+    'monitoring': ('monitor', 'grafana', 'prometheus', 'zabbix'),
+    'jenkins': ('jenkins', 'ci', 'cd', 'build'),
+    'wordpress': ('wp', 'wordpress', 'blog'),
+    'cms': ('cms', 'drupal', 'joomla', 'magento')
+}
+SUBDOMAIN_REPORT_ORDER = tuple(SUBDOMAIN_TAGS)
+
+# Ключевые слова короче этой длины сравниваются только с целыми метками хоста
+# (ci не находится в specific), более длинные ищутся и внутри меток (mail в webmail)
+SUBSTRING_KEYWORD_MIN_LEN = 4
+
+# Параметры запроса, указывающие на потенциальную уязвимость (порядок типов сохраняется в отчете)
+VULN_PARAMS = {
+    'sqli': ('id', 'user_id', 'product_id', 'page', 'offset', 'limit'),
+    'xss': ('search', 'q', 'query', 'keyword', 'term', 'input'),
+    'lfi': ('file', 'page', 'include', 'path', 'dir', 'document'),
+    'rce': ('cmd', 'command', 'exec', 'system', 'shell', 'run'),
+    'ssrf': ('url', 'link', 'redirect', 'next', 'target', 'callback'),
+    'open_redirect': ('redirect', 'return', 'next', 'url', 'link', 'goto')
+}
+
+# Типы, для которых значение параметра должно начинаться с цифры
+NUMERIC_VULN_TYPES = frozenset(('sqli',))
+
+def _build_param_index(vuln_params):
+    """Индекс: имя параметра в нижнем регистре -> список типов уязвимостей"""
+    index = defaultdict(list)
+    for vuln_type, names in vuln_params.items():
+        for name in names:
+            index[name].append(vuln_type)
+    return dict(index)
+
+PARAM_INDEX = _build_param_index(VULN_PARAMS)
+
+# Расширения файлов с потенциально чувствительной информацией (сравниваются с расширением пути)
+SENSITIVE_EXTENSIONS = frozenset((
+    'bak', 'backup', 'old', 'tmp', 'temp', 'log', 'sql', 'db', 'config', 'conf',
+    'env', 'ini', 'xml', 'json', 'yaml', 'yml'
+))
+
+# Предварительный фильтр строк в байтах: параметры уязвимостей требуют "=", плюс
+# маркеры API и чувствительные расширения. Строки без совпадения не декодируются
+URL_PREFILTER = re.compile(
+    rb"=|/api/|/rest/|/graphql|\.(?:" + "|".join(sorted(SENSITIVE_EXTENSIONS)).encode() + rb")",
+    re.I
+)
+
+def split_url(url):
+    """Хост (netloc), путь и строка запроса URL; фрагмент отбрасывается"""
+    rest = url.split('#', 1)[0]
+    rest, _, query = rest.partition('?')
+    scheme_end = rest.find('://')
+    if scheme_end == -1:
+        return '', rest, query
+    rest = rest[scheme_end + 3:]
+    slash = rest.find('/')
+    if slash == -1:
+        return rest, '', query
+    return rest[:slash], rest[slash:], query
+
+def match_url(url):
+    """
+    Находит признаки уязвимостей в URL.
+    Возвращает список пар (тип, запись) - не более одной записи каждого типа.
+    """
+    netloc, path, query = split_url(url)
+    found = []
+    matched = set()
+    
+    # Параметры уязвимостей: поиск имени параметра по индексу
+    if query:
+        for pair in query.split('&'):
+            name, eq, value = pair.partition('=')
+            if not eq:
+                continue
+            vuln_types = PARAM_INDEX.get(name.lower())
+            if not vuln_types:
+                continue
+            for vuln_type in vuln_types:
+                if vuln_type in matched:
+                    continue
+                if vuln_type in NUMERIC_VULN_TYPES:
+                    digits = len(value) - len(value.lstrip('0123456789'))
+                    if not digits:
+                        continue
+                    parameter = f"{name}={value[:digits]}"
+                else:
+                    parameter = f"{name}="
+                matched.add(vuln_type)
+                found.append((vuln_type, {
+                    'url': url,
+                    'parameter': parameter,
+                    'domain': netloc,
+                    'path': path
+                }))
+    
+    # Поиск API эндпоинтов
+    if '/api/' in url or '/rest/' in url or '/graphql' in url:
+        found.append(('api_endpoints', {
+            'url': url,
+            'method': 'GET',  # По умолчанию
+            'domain': netloc,
+            'path': path
+        }))
+    
+    # Файлы с потенциально чувствительной информацией: расширение последнего сегмента пути
+    last = path.rpartition('/')[2]
+    if '.' in last:
+        ext = last.rpartition('.')[2].lower()
+        if ext in SENSITIVE_EXTENSIONS:
+            found.append(('sensitive_files', {
+                'url': url,
+                'extension': f".{ext}",
+                'domain': netloc,
+                'path': path
+            }))
+    
+    return found
+
+class Reservoir:
+    """Равномерная случайная выборка не более size элементов из потока (алгоритм R)"""
+
+    def __init__(self, size, items=None, seen=0):
+        self.size = size
+        self.items = list(items or [])
+        self.seen = seen
+
+    def add(self, item):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+        elif random.random() * self.seen < self.size:
+            # random.random вместо randrange: вызывается для каждого элемента потока
+            self.items[int(random.random() * self.size)] = item
+
+    def merge(self, items, seen):
+        """
+        Объединяет с выборкой другой части потока (items из seen элементов).
+        Элементы берутся из каждой выборки пропорционально размеру ее части потока.
+        """
+        ours, theirs = list(self.items), list(items)
+        left, right = self.seen, seen
+        merged = []
+        while len(merged) < self.size and (left or right):
+            if random.randrange(left + right) < left:
+                left -= 1
+                merged.append(ours.pop(random.randrange(len(ours))))
+            else:
+                right -= 1
+                merged.append(theirs.pop(random.randrange(len(theirs))))
+        self.items = merged
+        self.seen += seen
+
+class ResultWriters:
+    """
+    Файлы категорий, открытые на запись: совпадение пишется сразу, в памяти остаются
+    только счетчики и случайная выборка samples записей каждой категории.
+    Файл категории создается при первом совпадении.
+    """
+
+    def __init__(self, output_dir, samples=ANALYZE_SAMPLES, suffix="_urls.txt"):
+        self.output_dir = output_dir
+        self.samples = samples
+        self.suffix = suffix
+        self.handles = {}
+        self.reservoirs = {}
+
+    def path(self, category):
+        return os.path.join(self.output_dir, f"{category}{self.suffix}")
+
+    def _open(self, category):
+        handle = open(self.path(category), 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+        self.handles[category] = handle
+        self.reservoirs[category] = Reservoir(self.samples)
+        return handle
+
+    def add(self, category, line, sample):
+        """Записывает строку совпадения категории; sample - запись для выборки в сводке"""
+        handle = self.handles.get(category)
+        if handle is None:
+            handle = self._open(category)
+        handle.write(line)
+        handle.write("\n")
+        self.reservoirs[category].add(sample)
+
+    def merge(self, category, path, entry):
+        """Дописывает файл категории, записанный для блока строк, вместе с его сводкой"""
+        handle = self.handles.get(category) or self._open(category)
+        with open(path, 'r', encoding='utf-8') as chunk_file:
+            shutil.copyfileobj(chunk_file, handle, WRITE_BUFFER_SIZE)
+        self.reservoirs[category].merge(entry['samples'], entry['count'])
+
+    @property
+    def summary(self):
+        """Сводка {категория: {'count': количество, 'samples': выборка}}"""
+        return {
+            category: {'count': reservoir.seen, 'samples': reservoir.items}
+            for category, reservoir in self.reservoirs.items()
+        }
+
+    def close(self):
+        for handle in self.handles.values():
+            handle.close()
+
+def _analyze_lines(lines, writers):
+    """Анализирует строки URL (bytes) и передает совпадения в writers"""
+    prefilter = URL_PREFILTER.search
+    for line in lines:
+        if not prefilter(line):
+            continue
+        url = line.decode('utf-8', 'ignore').strip()
+        if not url:
+            continue
+        for category, item in match_url(url):
+            writers.add(category, url, item)
+
+def _analyze_chunk(task):
+    """Анализирует блок строк в отдельном процессе; результаты пишутся в chunk_dir"""
+    chunk_dir, lines, samples = task
+    os.makedirs(chunk_dir)
+    writers = ResultWriters(chunk_dir, samples, suffix='')
+    try:
+        _analyze_lines(lines, writers)
+    finally:
+        writers.close()
+    return chunk_dir, writers.summary
+
+def _analyze_parallel(lines, writers, workers):
+    """
+    Анализ блоками в пуле процессов. Блоки сливаются в порядке чтения, поэтому
+    файлы категорий совпадают с однопроцессным режимом.
+    """
+    tmp_dir = tempfile.mkdtemp(prefix='bagbounty-analyze-')
+    
+    def merge(result):
+        chunk_dir, summary = result.get()
+        for category, entry in summary.items():
+            writers.merge(category, os.path.join(chunk_dir, category), entry)
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+    
+    try:
+        with multiprocessing.Pool(workers) as pool:
+            # Не более 2 блоков на процесс в очереди, чтобы не читать весь вход в память
+            pending = []
+            chunk = []
+            chunk_id = 0
+            for line in lines:
+                chunk.append(line)
+                if len(chunk) == ANALYZE_CHUNK_LINES:
+                    pending.append(pool.apply_async(
+                        _analyze_chunk, ((os.path.join(tmp_dir, str(chunk_id)), chunk, writers.samples),)
+                    ))
+                    chunk_id += 1
+                    chunk = []
+                    if len(pending) >= workers * 2:
+                        merge(pending.pop(0))
+            if chunk:
+                pending.append(pool.apply_async(
+                    _analyze_chunk, ((os.path.join(tmp_dir, str(chunk_id)), chunk, writers.samples),)
+                ))
+            for result in pending:
+                merge(result)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def analyze_urls(urls_file, output_dir, workers=1):
+    """
+    Анализирует URL на предмет потенциальных уязвимостей.
+    URL каждой категории сразу пишутся в <категория>_urls.txt; возвращается сводка
+    {категория: {'count': количество, 'samples': случайная выборка ANALYZE_SAMPLES записей}}.
+    workers > 1 - анализ блоками в пуле процессов с тем же результатом.
+    """
     if not os.path.exists(urls_file):
         print(f"[-] Файл {urls_file} не найден")
         return
     
     print(f"[+] Анализ URL из {urls_file}")
     
-    # Паттерны для поиска потенциальных уязвимостей
-    patterns = {
-        'sqli': [
-            r'id=\d+',
-            r'user_id=\d+',
-            r'product_id=\d+',
-            r'page=\d+',
-            r'offset=\d+',
-            r'limit=\d+'
-        ],
-        'xss': [
-            r'search=',
-            r'q=',
-            r'query=',
-            r'keyword=',
-            r'term=',
-            r'input='
-        ],
-        'lfi': [
-            r'file=',
-            r'page=',
-            r'include=',
-            r'path=',
-            r'dir=',
-            r'document='
-        ],
-        'rce': [
-            r'cmd=',
-            r'command=',
-            r'exec=',
-            r'system=',
-            r'shell=',
-            r'run='
-        ],
-        'ssrf': [
-            r'url=',
-            r'link=',
-            r'redirect=',
-            r'next=',
-            r'target=',
-            r'callback='
-        ],
-        'open_redirect': [
-            r'redirect=',
-            r'return=',
-            r'next=',
-            r'url=',
-            r'link=',
-            r'goto='
-        ]
-    }
+    writers = ResultWriters(output_dir)
+    try:
+        if workers > 1:
+            _analyze_parallel(iter_lines(urls_file), writers, workers)
+        else:
+            _analyze_lines(iter_lines(urls_file), writers)
+    finally:
+        writers.close()
     
-    results = defaultdict(list)
+    for vuln_type, entry in writers.summary.items():
+        print(f"[+] Найдено {entry['count']} потенциальных {vuln_type} URL")
     
-    with open(urls_file, 'r') as f:
-        for line in f:
-            url = line.strip()
-            if not url:
-                continue
-            
-            # Парсинг URL
-            try:
-                parsed = urlparse(url)
-                params = parse_qs(parsed.query)
-                
-                # Проверка параметров на потенциальные уязвимости
-                for vuln_type, vuln_patterns in patterns.items():
-                    for pattern in vuln_patterns:
-                        match = re.search(pattern, url, re.IGNORECASE)
-                        if match:
-                            results[vuln_type].append({
-                                'url': url,
-                                'parameter': match.group(),
-                                'domain': parsed.netloc,
-                                'path': parsed.path
-                            })
-                            break
-                
-                # Поиск API эндпоинтов
-                if '/api/' in url or '/rest/' in url or '/graphql' in url:
-                    results['api_endpoints'].append({
-                        'url': url,
-                        'method': 'GET',  # По умолчанию
-                        'domain': parsed.netloc,
-                        'path': parsed.path
-                    })
-                
-                # Поиск файлов с потенциально чувствительной информацией
-                sensitive_extensions = [
-                    '.bak', '.backup', '.old', '.tmp', '.temp',
-                    '.log', '.sql', '.db', '.config', '.conf',
-                    '.env', '.ini', '.xml', '.json', '.yaml', '.yml'
-                ]
-                
-                for ext in sensitive_extensions:
-                    if ext in url.lower():
-                        results['sensitive_files'].append({
-                            'url': url,
-                            'extension': ext,
-                            'domain': parsed.netloc,
-                            'path': parsed.path
-                        })
-                        break
-                        
-            except Exception as e:
-                print(f"[-] Ошибка парсинга URL {url}: {e}")
-    
-    # Сохранение результатов
-    for vuln_type, vuln_urls in results.items():
-        if vuln_urls:
-            output_file = os.path.join(output_dir, f"{vuln_type}_urls.txt")
-            with open(output_file, 'w') as f:
-                for item in vuln_urls:
-                    f.write(f"{item['url']}\n")
-            print(f"[+] Найдено {len(vuln_urls)} потенциальных {vuln_type} URL")
+    return writers.summary
+
+def _build_keyword_index(tags, min_len):
+    """
+    Индексы ключевых слов: короткие - словарь {слово: теги} для поиска по меткам,
+    длинные - одно регулярное выражение и словарь {слово: теги}
+    """
+    label_index = defaultdict(list)
+    substring_index = defaultdict(list)
+    for tag, keywords in tags.items():
+        for keyword in keywords:
+            index = substring_index if len(keyword) >= min_len else label_index
+            index[keyword].append(tag)
+    # Длинные слова раньше: при общем начале совпадает самое длинное
+    pattern = re.compile("|".join(sorted(substring_index, key=len, reverse=True)))
+    return dict(label_index), pattern, dict(substring_index)
+
+LABEL_KEYWORDS, SUBSTRING_KEYWORDS_RE, SUBSTRING_KEYWORDS = _build_keyword_index(
+    SUBDOMAIN_TAGS, SUBSTRING_KEYWORD_MIN_LEN
+)
+LABEL_SEPARATORS_RE = re.compile(r"[.\-_]+")
+
+def subdomain_tags(subdomain, domain=None):
+    """
+    Все теги поддомена за один проход. Метки целевого домена не учитываются.
+    Короткие ключевые слова совпадают с меткой целиком (номер в конце метки
+    отбрасывается: db01 -> db), длинные - с любой частью метки.
+    """
+    host = subdomain.lower()
+    if domain:
+        if host == domain:
+            return []
+        if host.endswith('.' + domain):
+            host = host[:-len(domain) - 1]
     
-    return results
+    found = []
+    for label in LABEL_SEPARATORS_RE.split(host):
+        for tag in LABEL_KEYWORDS.get(label.rstrip('0123456789'), ()):
+            if tag not in found:
+                found.append(tag)
+    for keyword in SUBSTRING_KEYWORDS_RE.findall(host):
+        for tag in SUBSTRING_KEYWORDS[keyword]:
+            if tag not in found:
+                found.append(tag)
+    return found
 
-def analyze_subdomains(subdomains_file, output_dir):
-    """Анализирует поддомены на предмет интересных паттернов"""
+def analyze_subdomains(subdomains_file, output_dir, domain=None):
+    """
+    Анализирует поддомены на предмет интересных паттернов.
+    Поддомен получает все подходящие теги и пишется в <тег>_subdomains.txt каждого из них;
+    возвращается сводка как у analyze_urls.
+    """
     if not os.path.exists(subdomains_file):
         print(f"[-] Файл {subdomains_file} не найден")
         return
     
     print(f"[+] Анализ поддоменов из {subdomains_file}")
     
-    interesting_patterns = {
-        'admin': r'admin',
-        'api': r'api',
-        'dev': r'dev|development|staging|test',
-        'internal': r'internal|intranet|private',
-        'cloud': r'cloud|aws|azure|gcp',
-        'mobile': r'mobile|app|ios|android',
-        'cdn': r'cdn|static|assets|media',
-        'mail': r'mail|smtp|pop|imap',
-        'database': r'db|database|mysql|postgres|mongo',
-        'monitoring': r'monitor|grafana|prometheus|zabbix',
-        'jenkins': r'jenkins|ci|cd|build',
-        'wordpress': r'wp|wordpress|blog',
-        'cms': r'cms|drupal|joomla|magento'
-    }
-    
-    results = defaultdict(list)
+    if domain:
+        domain = domain.lower()
     
-    with open(subdomains_file, 'r') as f:
-        for line in f:
-            subdomain = line.strip()
-            if not subdomain:
-                continue
-            
-            for pattern_name, pattern in interesting_patterns.items():
-                if re.search(pattern, subdomain, re.IGNORECASE):
-                    results[pattern_name].append(subdomain)
-                    break
+    writers = ResultWriters(output_dir, suffix="_subdomains.txt")
+    try:
+        with open(subdomains_file, 'r') as f:
+            for line in f:
+                subdomain = line.strip()
+                if not subdomain:
+                    continue
+                
+                for tag in subdomain_tags(subdomain, domain):
+                    writers.add(tag, subdomain, subdomain)
+    finally:
+        writers.close()
     
-    # Сохранение результатов
-    for pattern_name, subdomains in results.items():
-        if subdomains:
-            output_file = os.path.join(output_dir, f"{pattern_name}_subdomains.txt")
-            with open(output_file, 'w') as f:
-                for subdomain in subdomains:
-                    f.write(f"{subdomain}\n")
-            print(f"[+] Найдено {len(subdomains)} поддоменов с паттерном {pattern_name}")
+    for pattern_name, entry in writers.summary.items():
+        print(f"[+] Найдено {entry['count']} поддоменов с паттерном {pattern_name}")
     
-    return results
+    return writers.summary
 
-def generate_vulnerability_report(domain, results_dir, output_file):
-    """Генерирует отчет о потенциальных уязвимостях"""
+def generate_vulnerability_report(domain, url_summary, subdomain_summary, output_file):
+    """
+    Генерирует отчет о потенциальных уязвимостях по сводкам analyze_urls и analyze_subdomains.
+    Рядом с Markdown-отчетом записывается та же сводка в JSON (<отчет>.json).
+    Возвращает путь к JSON-сводке.
+    """
     print(f"[+] Генерация отчета о уязвимостях: {output_file}")
     
     with open(output_file, 'w', encoding='utf-8') as f:
@@ -189,51 +416,48 @@ def generate_vulnerability_report(domain, results_dir, output_file):
         
         # Анализ URL
         f.write("## Анализ URL\n\n")
-        url_patterns = ['sqli', 'xss', 'lfi', 'rce', 'ssrf', 'open_redirect', 'api_endpoints', 'sensitive_files']
-        
-        for pattern in url_patterns:
-            pattern_file = os.path.join(results_dir, f"{pattern}_urls.txt")
-            if os.path.exists(pattern_file):
-                count = sum(1 for _ in open(pattern_file))
+        for pattern in URL_REPORT_ORDER:
+            entry = url_summary.get(pattern)
+            if entry:
                 f.write(f"### {pattern.upper()}\n")
-                f.write(f"Найдено URL: {count}\n\n")
+                f.write(f"Найдено URL: {entry['count']}\n\n")
                 
-                # Показываем первые 10 примеров
-                with open(pattern_file, 'r') as url_file:
-                    for i, url in enumerate(url_file):
-                        if i < 10:
-                            f.write(f"- `{url.strip()}`\n")
-                        else:
-                            break
+                # Примеры из случайной выборки
+                for item in entry['samples']:
+                    f.write(f"- `{item['url']}`\n")
                 f.write("\n")
         
         # Анализ поддоменов
         f.write("## Анализ поддоменов\n\n")
-        subdomain_patterns = ['admin', 'api', 'dev', 'internal', 'cloud', 'mobile', 'cdn', 'mail', 'database', 'monitoring', 'jenkins', 'wordpress', 'cms']
-        
-        for pattern in subdomain_patterns:
-            pattern_file = os.path.join(results_dir, f"{pattern}_subdomains.txt")
-            if os.path.exists(pattern_file):
-                count = sum(1 for _ in open(pattern_file))
+        for pattern in SUBDOMAIN_REPORT_ORDER:
+            entry = subdomain_summary.get(pattern)
+            if entry:
                 f.write(f"### {pattern.upper()}\n")
-                f.write(f"Найдено поддоменов: {count}\n\n")
+                f.write(f"Найдено поддоменов: {entry['count']}\n\n")
                 
-                # Показываем первые 10 примеров
-                with open(pattern_file, 'r') as subdomain_file:
-                    for i, subdomain in enumerate(subdomain_file):
-                        if i < 10:
-                            f.write(f"- `{subdomain.strip()}`\n")
-                        else:
-                            break
+                for subdomain in entry['samples']:
+                    f.write(f"- `{subdomain}`\n")
                 f.write("\n")
-
-def main():
-    parser = argparse.ArgumentParser(description='Анализ результатов разведки')
-    parser.add_argument('domain', help='Target domain (e.g. example.com)')
-    args = parser.parse_args()
     
+    # JSON-сводка для других инструментов
+    json_file = f"{os.path.splitext(output_file)[0]}.json"
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            'domain': domain,
+            'urls': url_summary,
+            'subdomains': subdomain_summary
+        }, f, ensure_ascii=False, indent=2)
+    
+    return json_file
+
+def run(domain, recon_dir=None, workers=1):
+    """
+    Анализирует результаты разведки домена в текущем процессе.
+    workers - количество процессов для анализа URL.
+    Возвращает словарь со сводками анализа URL и поддоменов и путями к отчету и JSON-сводке.
+    """
     # Пути к файлам
-    recon_dir = f"recon-{args.domain}"
+    recon_dir = recon_dir or f"recon-{domain}"
     urls_file = f"{recon_dir}/urls/all_urls.txt"
     subdomains_file = f"{recon_dir}/subdomains/subdomains.txt"
     analysis_dir = f"{recon_dir}/analysis"
@@ -241,25 +465,50 @@ def main():
     # Создание директории для анализа
     os.makedirs(analysis_dir, exist_ok=True)
     
-    print(f"[=== Анализ результатов разведки для {args.domain} ===]\n")
+    print(f"[=== Анализ результатов разведки для {domain} ===]\n")
     
     # Анализ URL
+    url_results = None
     if os.path.exists(urls_file):
-        analyze_urls(urls_file, analysis_dir)
+        url_results = analyze_urls(urls_file, analysis_dir, workers=workers)
+        # Типы уязвимостей записываются метками в хранилище URL запуска
+        url_store_file = store_path(recon_dir)
+        if url_results and os.path.exists(url_store_file):
+            with UrlStore(url_store_file) as store:
+                for vuln_type in url_results:
+                    with open(os.path.join(analysis_dir, f"{vuln_type}_urls.txt"), 'r', encoding='utf-8') as f:
+                        store.add_tags(vuln_type, (line.rstrip('\n') for line in f))
     else:
         print(f"[-] Файл с URL не найден: {urls_file}")
     
     # Анализ поддоменов
+    subdomain_results = None
     if os.path.exists(subdomains_file):
-        analyze_subdomains(subdomains_file, analysis_dir)
+        subdomain_results = analyze_subdomains(subdomains_file, analysis_dir, domain=domain)
     else:
         print(f"[-] Файл с поддоменами не найден: {subdomains_file}")
     
     # Генерация отчета
     report_file = f"{analysis_dir}/vulnerability_report.md"
-    generate_vulnerability_report(args.domain, analysis_dir, report_file)
+    summary_file = generate_vulnerability_report(domain, url_results or {}, subdomain_results or {}, report_file)
     
     print(f"\n[=== Анализ завершен! Отчет: {report_file} ===]")
+    
+    return {
+        'analysis_dir': analysis_dir,
+        'urls': url_results or {},
+        'subdomains': subdomain_results or {},
+        'report_file': report_file,
+        'summary_file': summary_file
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Анализ результатов разведки')
+    parser.add_argument('domain', help='Target domain (e.g. example.com)')
+    parser.add_argument('--workers', type=int, default=1, help='Количество процессов для анализа URL (по умолчанию: 1)')
+    args = parser.parse_args()
+    
+    run(args.domain, workers=args.workers)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -2,20 +2,76 @@
 import os
 import re
 import sys
+import time
+import heapq
+import shutil
 import argparse
-from urllib.parse import urlparse, parse_qs
+import tempfile
+import multiprocessing
+from urllib.parse import urlparse, urlsplit, parse_qs
 
-# Расширения, которые считаются неинтересными (статикой)
-STATIC_EXT = re.compile(
-    r"\.(?:jpg|jpeg|png|gif|svg|css|woff2?|ttf|eot|ico|mp4|webm|avi|mov|mp3|ogg|wav|zip|rar|7z|tar|gz|webp|bmp|pdf|swf|psd|exe|dmg|apk|bin|jar|m4a|m4v|csv|md|txt|xml|map|log|yml|yaml|rss|atom|cache|bak|backup|dll|dat|db|lock|sh|bat|out|tmp|sample|example|test|spec|conf|config|manifest|robots\.txt)$", 
-    re.I
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.line_reader import iter_lines
+from src.utils.dedup import (
+    partition_of, fingerprint, make_dedup_set, DEDUP_MODES, ExactSet, FingerprintSet
+)
+from config.settings import (
+    FILTER_CHUNK_LINES, DEDUP_PARTITIONS, DEDUP_BLOOM_CAPACITY, DEDUP_BLOOM_FP_RATE
 )
 
+# Средний размер строки URL для оценки числа строк по размеру входного файла
+AVG_URL_BYTES = 60
+
+# Кодировка промежуточных файлов параллельного режима (произвольные байты сохраняются)
+PART_ENCODING = {'encoding': 'utf-8', 'errors': 'surrogateescape'}
+
+# Расширения, которые считаются неинтересными (статикой)
+STATIC_EXTENSIONS = frozenset((
+    'jpg', 'jpeg', 'png', 'gif', 'svg', 'css', 'woff', 'woff2', 'ttf', 'eot', 'ico', 'mp4', 'webm',
+    'avi', 'mov', 'mp3', 'ogg', 'wav', 'zip', 'rar', '7z', 'tar', 'gz', 'webp', 'bmp', 'pdf', 'swf',
+    'psd', 'exe', 'dmg', 'apk', 'bin', 'jar', 'm4a', 'm4v', 'csv', 'md', 'txt', 'xml', 'map', 'log',
+    'yml', 'yaml', 'rss', 'atom', 'cache', 'bak', 'backup', 'dll', 'dat', 'db', 'lock', 'sh', 'bat',
+    'out', 'tmp', 'sample', 'example', 'test', 'spec', 'conf', 'config', 'manifest'
+))
+STATIC_EXT = re.compile(r"\.(?:" + "|".join(sorted(STATIC_EXTENSIONS)) + r")$", re.I)
+
+# Статика по этим путям не отбрасывается
+API_MARKERS = ("/api/", "/v1/", "/v2/")
+
 # Паттерны для фильтрации мусора и 404
 TRASH_PATTERNS = [
     re.compile(r"/(?:404|not[-_]?found|error|invalid|doesnotexist|missing|unavailable)/?$", re.I),
     re.compile(r"[?&](?:error|msg|message|reason)=", re.I),
 ]
+# Те же проверки без поиска по всей строке: последний сегмент пути (первый паттерн)
+# сравнивается по множеству, регулярное выражение по параметрам - только при наличии ? или &
+TRASH_SEGMENTS = frozenset((
+    '404', 'notfound', 'not-found', 'not_found', 'error', 'invalid', 'doesnotexist', 'missing', 'unavailable'
+))
+TRASH_QUERY_RE = re.compile(r"[?&](?:error|msg|message|reason)=")
+
+# Байтовые варианты для ASCII-строк (решения совпадают с is_interesting)
+STATIC_EXTENSIONS_BYTES = frozenset(ext.encode() for ext in STATIC_EXTENSIONS)
+TRASH_SEGMENTS_BYTES = frozenset(segment.encode() for segment in TRASH_SEGMENTS)
+TRASH_QUERY_RE_BYTES = re.compile(TRASH_QUERY_RE.pattern.encode())
+
+def _is_trash(url_lower):
+    """Эквивалент TRASH_PATTERNS для URL в нижнем регистре"""
+    tail = url_lower[:-1] if url_lower.endswith('/') else url_lower
+    slash = tail.rfind('/')
+    if slash != -1 and tail[slash + 1:] in TRASH_SEGMENTS:
+        return True
+    return ('?' in url_lower or '&' in url_lower) and TRASH_QUERY_RE.search(url_lower) is not None
+
+def _is_trash_bytes(line_lower):
+    """_is_trash для ASCII-строки в байтах"""
+    tail = line_lower[:-1] if line_lower.endswith(b'/') else line_lower
+    slash = tail.rfind(b'/')
+    if slash != -1 and tail[slash + 1:] in TRASH_SEGMENTS_BYTES:
+        return True
+    return (b'?' in line_lower or b'&' in line_lower) and TRASH_QUERY_RE_BYTES.search(line_lower) is not None
 
 def normalize_url(url):
     """Нормализация URL для дедупликации"""
@@ -24,8 +80,109 @@ def normalize_url(url):
     clean_url = parsed._replace(fragment="").geturl()
     return clean_url.lower()
 
+# Заполнители изменяемых сегментов пути для определения формы URL (порядок важен)
+SHAPE_SEGMENTS = [
+    ('{uuid}', re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)),
+    ('{date}', re.compile(r"(?:19|20)\d\d[-_.]?(?:0[1-9]|1[0-2])[-_.]?(?:0[1-9]|[12]\d|3[01])")),
+    ('{int}', re.compile(r"\d+")),
+    ('{hash}', re.compile(r"[0-9a-f]{16,}", re.I)),
+]
+
+def _segment_shape(segment):
+    """Заменяет изменяемый сегмент пути заполнителем (расширение файла сохраняется)"""
+    stem, dot, ext = segment.partition('.')
+    for placeholder, pattern in SHAPE_SEGMENTS:
+        if pattern.fullmatch(stem):
+            return placeholder + dot + ext
+    return segment
+
+def url_shape(url):
+    """
+    Форма URL: числовые, UUID, хеш- и дата-сегменты пути заменяются заполнителями,
+    значения параметров отбрасываются, имена параметров сортируются.
+    /product/123?id=5 и /product/456?id=9 имеют одну форму /product/{int}?id
+    """
+    parts = urlsplit(url.lower())
+    path = '/'.join(_segment_shape(segment) for segment in parts.path.split('/'))
+    shape = f"{parts.scheme}://{parts.netloc}{path}"
+    if parts.query:
+        names = sorted({param.partition('=')[0] for param in parts.query.split('&') if param})
+        shape += '?' + '&'.join(names)
+    return shape
+
+def limit_per_shape(urls, keep):
+    """Выдает не более keep URL каждой формы (в порядке появления)"""
+    counts = {}
+    for url in urls:
+        key = fingerprint(url_shape(url))
+        count = counts.get(key, 0)
+        if count < keep:
+            counts[key] = count + 1
+            yield url
+
 def is_interesting(url, args):
-    """Проверяет, интересен ли URL для багбаунти"""
+    """
+    Проверяет, интересен ли URL для багбаунти.
+    Сначала дешевые проверки (длина, расширение по множеству), urlparse - только при
+    фильтрах портов, мусорные паттерны - по последнему сегменту пути и параметрам.
+    """
+    if len(url) > args.max_url_len:
+        return False
+    
+    if args.exclude_ports or args.exclude_non_std_ports:
+        port = urlparse(url).port
+        if port:
+            if args.exclude_ports and port in args.exclude_ports:
+                return False
+            if args.exclude_non_std_ports and port not in (80, 443):
+                return False
+    
+    url_lower = url.lower()
+    
+    # Статика: расширение в конце URL (как у STATIC_EXT), кроме API endpoints
+    dot = url_lower.rfind('.')
+    if dot != -1 and url_lower[dot + 1:] in STATIC_EXTENSIONS:
+        if "/api/" not in url_lower and "/v1/" not in url_lower and "/v2/" not in url_lower:
+            return False
+    
+    return not _is_trash(url_lower)
+
+def interesting_line(line, args):
+    """
+    Вариант is_interesting для непустой строки в байтах без пробелов по краям.
+    Возвращает URL (str), если он интересен, иначе None. ASCII-строки проверяются без
+    декодирования и декодируются, только если прошли фильтр; прочие строки декодируются
+    и проверяются через is_interesting.
+    """
+    if not line.isascii():
+        url = line.decode('utf-8', 'ignore').strip()
+        return url if url and is_interesting(url, args) else None
+    
+    if len(line) > args.max_url_len:
+        return None
+    
+    url = None
+    if args.exclude_ports or args.exclude_non_std_ports:
+        url = line.decode('ascii')
+        port = urlparse(url).port
+        if port:
+            if args.exclude_ports and port in args.exclude_ports:
+                return None
+            if args.exclude_non_std_ports and port not in (80, 443):
+                return None
+    
+    line_lower = line.lower()
+    dot = line_lower.rfind(b'.')
+    if dot != -1 and line_lower[dot + 1:] in STATIC_EXTENSIONS_BYTES:
+        if b"/api/" not in line_lower and b"/v1/" not in line_lower and b"/v2/" not in line_lower:
+            return None
+    
+    if _is_trash_bytes(line_lower):
+        return None
+    return url or line.decode('ascii')
+
+def _is_interesting_baseline(url, args):
+    """Исходная реализация is_interesting - эталон для --benchmark"""
     # Проверка длины URL
     if len(url) > args.max_url_len:
         return False
@@ -44,7 +201,7 @@ def is_interesting(url, args):
     # Фильтрация статики (с исключением для API)
     if STATIC_EXT.search(url_lower):
         # Оставляем API endpoints
-        if not ("/api/" in url_lower or "/v1/" in url_lower or "/v2/" in url_lower):
+        if not any(marker in url_lower for marker in API_MARKERS):
             return False
 
     # Фильтрация мусорных паттернов
@@ -59,20 +216,77 @@ def has_params(url):
     parsed = urlparse(url)
     return bool(parse_qs(parsed.query))
 
-def clean_urls(input_file, output_file, args):
-    seen = set()
+def _text_candidates(lines, args):
+    """Для каждой непустой строки текста: (номер строки, URL или None, если он неинтересен)"""
+    for index, line in enumerate(lines):
+        url = line.strip()
+        if not url:
+            continue
+        try:
+            yield index, (url if is_interesting(url, args) else None)
+        except ValueError:
+            # Некорректный URL (например, неверный порт) пропускается
+            yield index, None
+
+def _bytes_candidates(lines, args):
+    """
+    То же для строк в байтах: декодируются только интересные URL.
+    Частый случай (ASCII-строка, без фильтров портов) проверяется здесь же без вызова
+    interesting_line - это заметная часть стоимости строки.
+    """
+    max_len = args.max_url_len
+    port_filters = bool(args.exclude_ports or args.exclude_non_std_ports)
+    static_extensions = STATIC_EXTENSIONS_BYTES
+    for index, raw in enumerate(lines):
+        line = raw.strip()
+        if not line:
+            continue
+        if port_filters or not line.isascii():
+            try:
+                yield index, interesting_line(line, args)
+            except ValueError:
+                yield index, None
+            continue
+        if len(line) > max_len:
+            yield index, None
+            continue
+        line_lower = line.lower()
+        dot = line_lower.rfind(b'.')
+        if (dot != -1 and line_lower[dot + 1:] in static_extensions
+                and b"/api/" not in line_lower and b"/v1/" not in line_lower and b"/v2/" not in line_lower):
+            yield index, None
+        elif _is_trash_bytes(line_lower):
+            yield index, None
+        else:
+            yield index, line.decode('ascii')
+
+def _clean(candidates, output_file, args):
+    """Дедуплицирует интересные URL и записывает их в output_file"""
+    seen = make_dedup_set(args.dedup, fp_rate=args.fp_rate)
+    # Количество оставленных URL каждой формы (по отпечатку формы)
+    shapes = {} if args.keep_per_shape else None
+    total_count = 0
     unique_count = 0
     try:
-        for line in input_file:
-            url = line.strip()
-            if not url:
+        for _, url in candidates:
+            total_count += 1
+            if url is None:
                 continue
-            norm = normalize_url(url)
-            if norm in seen:
+            try:
+                norm = normalize_url(url)
+            except ValueError:
                 continue
-            if not is_interesting(url, args):
+            if not seen.add(norm):
                 continue
-            seen.add(norm)
+            if shapes is not None:
+                try:
+                    key = fingerprint(url_shape(norm))
+                except ValueError:
+                    continue
+                count = shapes.get(key, 0)
+                if count >= args.keep_per_shape:
+                    continue
+                shapes[key] = count + 1
             try:
                 print(url, file=output_file)
                 unique_count += 1
@@ -80,9 +294,238 @@ def clean_urls(input_file, output_file, args):
                 print(f"[-] Ошибка при записи URL: {e}", file=sys.stderr)
     except Exception as e:
         print(f"[-] Ошибка при обработке входного файла: {e}", file=sys.stderr)
-    return unique_count
+    return {'total': total_count, 'unique': unique_count}
 
-if __name__ == "__main__":
+def clean_urls(input_file, output_file, args=None):
+    """
+    Фильтрует и дедуплицирует URL из input_file в output_file.
+    Возвращает словарь со статистикой: обработано строк и уникальных URL.
+    """
+    if args is None:
+        args = default_args()
+    if args.workers > 1 or args.max_memory:
+        try:
+            size = os.fstat(input_file.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            size = None
+        return clean_urls_partitioned(input_file, output_file, args, size=size)
+    return _clean(_text_candidates(input_file, args), output_file, args)
+
+def clean_url_file(path, output_file, args=None):
+    """
+    То же, что clean_urls, но читает файл по пути построчно в байтах (mmap, .gz, .zst):
+    строки декодируются, только если URL прошел фильтр.
+    """
+    if args is None:
+        args = default_args()
+    if args.workers > 1 or args.max_memory:
+        return clean_urls_partitioned(iter_lines(path), output_file, args,
+                                      binary=True, size=os.path.getsize(path))
+    return _clean(_bytes_candidates(iter_lines(path), args), output_file, args)
+
+def _filter_options(args):
+    """Параметры фильтрации без открытых файлов (для передачи в процессы)"""
+    return argparse.Namespace(
+        max_url_len=args.max_url_len,
+        exclude_ports=args.exclude_ports,
+        exclude_non_std_ports=args.exclude_non_std_ports,
+        params_only=args.params_only,
+        keep_per_shape=args.keep_per_shape
+    )
+
+def _filter_chunk(task):
+    """
+    Этап map: фильтрует блок строк и раскладывает интересные URL по разделам
+    по хешу нормализованного URL (при --keep-per-shape - по хешу формы, чтобы все URL
+    одной формы попали в один раздел). Каждая запись хранит номер исходной строки.
+    Возвращает количество непустых строк в блоке.
+    """
+    chunk_id, start, lines, binary, options, tmp_dir, partitions = task
+    candidates = (_bytes_candidates if binary else _text_candidates)(lines, options)
+    handles = {}
+    total = 0
+    try:
+        for offset, url in candidates:
+            total += 1
+            if url is None:
+                continue
+            try:
+                norm = normalize_url(url)
+                shape = url_shape(norm) if options.keep_per_shape else ''
+            except ValueError:
+                continue
+            part = partition_of(shape or norm, partitions)
+            handle = handles.get(part)
+            if handle is None:
+                part_dir = os.path.join(tmp_dir, f"part-{part:04d}")
+                os.makedirs(part_dir, exist_ok=True)
+                handle = handles[part] = open(
+                    os.path.join(part_dir, f"chunk-{chunk_id:08d}.txt"), 'w', **PART_ENCODING
+                )
+            # Длины нормализованного URL и формы позволяют хранить их и исходный URL без разделителя
+            handle.write(f"{start + offset}\t{len(norm)}\t{len(shape)}\t{norm}{shape}{url}\n")
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return total
+
+def _dedup_partition(task):
+    """
+    Этап reduce: оставляет первое вхождение каждого нормализованного URL раздела.
+    Блоки читаются по порядку, поэтому результат упорядочен по номеру строки.
+    """
+    part_dir, mode, capacity, fp_rate, keep_per_shape = task
+    seen = make_dedup_set(mode, capacity=capacity, fp_rate=fp_rate)
+    shapes = {}
+    out_path = f"{part_dir}.out"
+    with open(out_path, 'w', **PART_ENCODING) as out:
+        for name in sorted(os.listdir(part_dir)):
+            with open(os.path.join(part_dir, name), 'r', newline='\n', **PART_ENCODING) as f:
+                for line in f:
+                    index, norm_length, shape_length, rest = line[:-1].split('\t', 3)
+                    norm_length = int(norm_length)
+                    url_start = norm_length + int(shape_length)
+                    if not seen.add(rest[:norm_length]):
+                        continue
+                    if keep_per_shape:
+                        key = fingerprint(rest[norm_length:url_start])
+                        count = shapes.get(key, 0)
+                        if count >= keep_per_shape:
+                            continue
+                        shapes[key] = count + 1
+                    out.write(f"{index}\t{rest[url_start:]}\n")
+    shutil.rmtree(part_dir)
+    return out_path
+
+def _read_partition_output(path):
+    with open(path, 'r', newline='\n', **PART_ENCODING) as f:
+        for line in f:
+            index, url = line[:-1].split('\t', 1)
+            yield int(index), url
+
+def _partitions_count(size, args):
+    """
+    Количество разделов на диске. При ограничении памяти (--max-memory) разделов столько,
+    чтобы множества одновременно обрабатываемых разделов поместились в лимит; число
+    строк оценивается по размеру входного файла.
+    """
+    partitions = max(DEDUP_PARTITIONS, args.workers)
+    if not args.max_memory:
+        return partitions
+    if size is not None:
+        estimated_items = size // AVG_URL_BYTES
+    else:
+        # Поток без размера (stdin, генератор) - оцениваем по порогу фильтра Блума
+        estimated_items = DEDUP_BLOOM_CAPACITY
+    bytes_per_item = ExactSet.BYTES_PER_ITEM if args.dedup == 'exact' else FingerprintSet.BYTES_PER_ITEM
+    budget = args.max_memory * 1024 * 1024 // args.workers
+    return max(partitions, -(-estimated_items * bytes_per_item // budget))
+
+def clean_urls_partitioned(input_file, output_file, args, binary=False, size=None):
+    """
+    Вариант clean_urls с разделами на диске и тем же результатом.
+    Блоки строк фильтруются в пуле процессов, интересные URL раскладываются по разделам
+    по хешу нормализованного URL, каждый раздел дедуплицируется отдельно (без общего
+    множества), затем разделы сливаются по номеру исходной строки - порядок вывода
+    совпадает с однопроцессным режимом. Память ограничена множеством одного раздела
+    на процесс, что позволяет обрабатывать списки больше доступной памяти (--max-memory).
+    input_file - итерируемый источник строк (str или bytes при binary=True),
+    size - размер входа в байтах для оценки числа разделов.
+    """
+    options = _filter_options(args)
+    workers = args.workers
+    partitions = _partitions_count(size, args)
+    bloom_capacity = -(-DEDUP_BLOOM_CAPACITY // partitions)
+    tmp_dir = tempfile.mkdtemp(prefix='bagbounty-filter-')
+    total_count = 0
+    unique_count = 0
+    try:
+        with multiprocessing.Pool(workers) as pool:
+            # Не более 2 блоков на процесс в очереди, чтобы не читать весь вход в память
+            pending = []
+            start = 0
+            chunk_id = 0
+            lines = []
+            for line in input_file:
+                lines.append(line)
+                if len(lines) == FILTER_CHUNK_LINES:
+                    pending.append(pool.apply_async(
+                        _filter_chunk, ((chunk_id, start, lines, binary, options, tmp_dir, partitions),)
+                    ))
+                    chunk_id += 1
+                    start += len(lines)
+                    lines = []
+                    if len(pending) >= workers * 2:
+                        total_count += pending.pop(0).get()
+            if lines:
+                pending.append(pool.apply_async(
+                    _filter_chunk, ((chunk_id, start, lines, binary, options, tmp_dir, partitions),)
+                ))
+            for result in pending:
+                total_count += result.get()
+            
+            part_dirs = sorted(
+                os.path.join(tmp_dir, name) for name in os.listdir(tmp_dir) if name.startswith('part-')
+            )
+            outputs = pool.map(_dedup_partition, [
+                (part_dir, args.dedup, bloom_capacity if args.dedup == 'bloom' else None, args.fp_rate,
+                 args.keep_per_shape)
+                for part_dir in part_dirs
+            ])
+        
+        for _, url in heapq.merge(*(_read_partition_output(path) for path in outputs)):
+            try:
+                print(url, file=output_file)
+                unique_count += 1
+            except Exception as e:
+                print(f"[-] Ошибка при записи URL: {e}", file=sys.stderr)
+    except Exception as e:
+        print(f"[-] Ошибка при обработке входного файла: {e}", file=sys.stderr)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return {'total': total_count, 'unique': unique_count}
+
+def benchmark(input_file, args, repeat=3):
+    """
+    Сравнивает is_interesting с исходной реализацией на URL из input_file:
+    проверяет совпадение решений и выводит время на один URL (лучшее из repeat прогонов).
+    """
+    urls = [line.strip() for line in input_file if line.strip()]
+    if not urls:
+        print("[-] Нет URL для замера", file=sys.stderr)
+        return None
+    
+    def decisions(check):
+        result = []
+        for url in urls:
+            try:
+                result.append(check(url, args))
+            except ValueError:
+                result.append(None)
+        return result
+    
+    if decisions(is_interesting) != decisions(_is_interesting_baseline):
+        print("[-] Решения is_interesting расходятся с исходной реализацией", file=sys.stderr)
+    
+    timings = {}
+    for name, check in (('baseline', _is_interesting_baseline), ('fast', is_interesting)):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            decisions(check)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best / len(urls) * 1e9
+    
+    print(
+        f"URL: {len(urls)}, исходная: {timings['baseline']:.0f} нс/URL, "
+        f"новая: {timings['fast']:.0f} нс/URL, ускорение: {timings['baseline'] / timings['fast']:.2f}x",
+        file=sys.stderr
+    )
+    return timings
+
+def build_parser():
+    """Создает парсер аргументов командной строки"""
     parser = argparse.ArgumentParser(
         description="Фильтрация и очистка URL для багбаунти",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
@@ -90,9 +533,8 @@ if __name__ == "__main__":
     parser.add_argument(
         "input", 
         nargs='?', 
-        type=argparse.FileType('r'), 
-        default=sys.stdin,
-        help="Входной файл с URL (используйте '-' для stdin)"
+        default='-',
+        help="Входной файл с URL, в том числе .gz/.zst (используйте '-' для stdin)"
     )
     parser.add_argument(
         "-o", "--output", 
@@ -121,7 +563,56 @@ if __name__ == "__main__":
         default=2000,
         help="Максимальная длина URL"
     )
-    
-    args = parser.parse_args()
-    unique_count = clean_urls(args.input, args.output, args)
-    print(f"Обработка завершена. Уникальных URL: {unique_count}", file=sys.stderr)
\ No newline at end of file
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Количество процессов (больше 1 - параллельная обработка по разделам)"
+    )
+    parser.add_argument(
+        "--dedup",
+        choices=DEDUP_MODES,
+        default='fingerprint',
+        help="Дедупликация: 64-битные отпечатки, точные строки или фильтр Блума"
+    )
+    parser.add_argument(
+        "--fp-rate",
+        type=float,
+        default=DEDUP_BLOOM_FP_RATE,
+        help="Доля ложных срабатываний фильтра Блума"
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=int,
+        help="Лимит памяти на дедупликацию в MB (включает обработку по разделам на диске)"
+    )
+    parser.add_argument(
+        "--keep-per-shape",
+        type=int,
+        help="Оставлять не более K URL одной формы (/product/{int}?id)"
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Замерить is_interesting на входных URL по сравнению с исходной реализацией"
+    )
+    return parser
+
+def default_args(**overrides):
+    """Возвращает параметры фильтрации по умолчанию для вызова из кода"""
+    args = build_parser().parse_args([])
+    for key, value in overrides.items():
+        setattr(args, key, value)
+    return args
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    if args.benchmark:
+        with (open(args.input, 'r') if args.input != '-' else sys.stdin) as input_file:
+            benchmark(input_file, args)
+        sys.exit(0)
+    if args.input == '-':
+        stats = clean_urls(sys.stdin, args.output, args)
+    else:
+        stats = clean_url_file(args.input, args.output, args)
+    print(f"Обработка завершена. Уникальных URL: {stats['unique']}", file=sys.stderr)
@@ -0,0 +1,3 @@
+"""
+Модуль разведки для BagBountyAuto
+""" 
\ No newline at end of file
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Скачивание файлов для BagBountyAuto
+Параллельная загрузка списков URL через AsyncHTTPClient с переиспользованием соединений.
+Тела сохраняются в BlobStore по хешу, в директориях категорий остаются ссылки на объекты.
+"""
+
+import os
+import re
+import sys
+import asyncio
+from urllib.parse import urlsplit, unquote
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.http_client import AsyncHTTPClient
+from src.utils.blob_store import BlobStore
+from src.recon.url_processing import iter_url_file
+from config.settings import DOWNLOAD_CONFIG
+
+# Символы, недопустимые в именах файлов Windows (аналог wget --restrict-file-names=windows)
+UNSAFE_FILENAME_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+def filename_for_url(url):
+    """Имя файла для URL: последний сегмент пути и запрос, как у wget"""
+    parts = urlsplit(url)
+    name = unquote(parts.path.rsplit('/', 1)[-1]) or 'index.html'
+    if parts.query:
+        name += f"@{parts.query}"
+    name = UNSAFE_FILENAME_CHARS.sub('_', name)
+    return name[:200]
+
+def _unique_path(output_dir, name, taken):
+    """Подбирает свободное имя: name, name.1, name.2, ..."""
+    path = os.path.join(output_dir, name)
+    counter = 0
+    while path in taken or os.path.exists(path):
+        counter += 1
+        path = os.path.join(output_dir, f"{name}.{counter}")
+    taken.add(path)
+    return path
+
+async def _download_one(client, store, url, path, job, max_size, stats):
+    """Скачивает один URL в хранилище, записывая тело по мере получения"""
+    writer = store.writer()
+    try:
+        response = await client.request(url, sink=writer.write, max_size=max_size)
+    except BaseException:
+        writer.discard()
+        raise
+
+    if response.ok and 200 <= response.status < 300:
+        sha256 = store.commit(writer)
+        store.record(url, sha256, writer.size, job['domain'], job['category'])
+        # Файл в директории категории - ссылка на объект хранилища
+        store.link(sha256, path)
+        stats['downloaded'] += 1
+        stats['bytes'] += response.length
+        stats['blobs'].add(sha256)
+    else:
+        writer.discard()
+        stats['failed'] += 1
+    return response
+
+async def download_all(jobs, store, config=None):
+    """
+    Скачивает задания одним клиентом с общим пулом соединений.
+    jobs - список словарей с ключами url, output_dir, domain, category.
+    Возвращает статистику по каждой директории.
+    """
+    config = {**DOWNLOAD_CONFIG, **(config or {})}
+    max_size = config['max_size_mb'] * 1024 * 1024
+    stats = {}
+    taken = set()
+
+    async with AsyncHTTPClient(
+        max_connections=config['max_connections'],
+        max_per_host=config['max_per_host'],
+        timeout=config['timeout']
+    ) as client:
+        tasks = []
+        for job in jobs:
+            output_dir = job['output_dir']
+            os.makedirs(output_dir, exist_ok=True)
+            dir_stats = stats.setdefault(output_dir, {'downloaded': 0, 'failed': 0, 'bytes': 0, 'blobs': set()})
+            path = _unique_path(output_dir, filename_for_url(job['url']), taken)
+            tasks.append(_download_one(client, store, job['url'], path, job, max_size, dir_stats))
+        await asyncio.gather(*tasks)
+
+    for dir_stats in stats.values():
+        dir_stats['unique'] = len(dir_stats.pop('blobs'))
+    return stats
+
+def download_url_files(categories, domain, store=None, config=None):
+    """
+    Скачивает URL из файлов категорий в хранилище по хешу содержимого.
+    categories - словарь {категория: (файл со списком URL, директория для ссылок)}.
+    """
+    jobs = []
+    seen = set()
+    for category, (urls_file, output_dir) in categories.items():
+        for url in iter_url_file(urls_file):
+            if url and (url, category) not in seen:
+                seen.add((url, category))
+                jobs.append({'url': url, 'output_dir': output_dir, 'domain': domain, 'category': category})
+
+    if not jobs:
+        return {}
+
+    own_store = store is None
+    store = store or BlobStore()
+    try:
+        return asyncio.run(download_all(jobs, store, config))
+    finally:
+        if own_store:
+            store.close()
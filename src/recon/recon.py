@@ -7,17 +7,27 @@ import os
 import sys
 import subprocess
 import argparse
-from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlsplit
 
 # Добавляем путь к корневой директории проекта
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from src.utils.common import (
     run_command_with_activity_monitor, count_lines, setup_workspace, get_timestamp,
-    print_status, print_success, print_error, time_tracker
+    print_status, print_success, print_error, time_tracker, StageError
 )
 from src.utils.reports_manager import get_report_path
-from config.settings import TOOLS, PORTS, THREADS, KATANA_DEPTH, BLACKLIST_EXT, SENSITIVE_EXT
+from src.utils.scheduler import StageScheduler
+from src.recon.streaming import StreamingRecon
+from src.recon.url_processing import classify_urls, write_urls, iter_url_file, URL_FILE_ENCODING
+from src.recon.downloader import download_url_files
+from src.recon.state import ReconState
+from src.utils.cache import ToolCache, cache_key
+from src.utils.url_store import UrlStore, NEW_TAG, INCREMENTAL
+from config.settings import (
+    TOOLS, PORTS, THREADS, KATANA_DEPTH, BLACKLIST_EXT, RECON_STAGE_WORKERS, STATE_CONFIG, URL_STORE_FILE
+)
 
 def check_tools():
     """Проверяет наличие необходимых инструментов"""
@@ -41,173 +51,349 @@ def check_tools():
     time_tracker.end_stage("Проверка инструментов")
     return True
 
-def main():
-    parser = argparse.ArgumentParser(description='BagBountyAuto - Разведка домена')
-    parser.add_argument('domain', help='Target domain (e.g. example.com)')
-    parser.add_argument('--reports-dir', help='Директория для отчетов')
-    parser.add_argument('--activity-timeout', type=int, default=60, help='Таймаут неактивности в секундах (по умолчанию: 60)')
-    args = parser.parse_args()
-    
-    # Начинаем общий отсчет времени для разведки
-    time_tracker.start_total()
-    
-    # Проверка инструментов
-    if not check_tools():
-        time_tracker.end_total()
-        return
-    
-    # Настройка рабочего пространства
-    time_tracker.start_stage("Настройка рабочего пространства")
-    dirs = setup_workspace(args.domain)
-    timestamp = get_timestamp()
-    time_tracker.end_stage("Настройка рабочего пространства")
-    
-    print_status(f"Начало разведки для {args.domain}")
-    print_status(f"Таймаут неактивности: {args.activity_timeout}с")
+def write_lines(lines, path):
+    """Записывает строки в файл и возвращает их количество"""
+    count = 0
+    with open(path, 'w', **URL_FILE_ENCODING) as f:
+        for line in lines:
+            if line:
+                f.write(f"{line}\n")
+                count += 1
+    return count
+
+def record_alive(state, alive_file):
+    """Запоминает живые хосты в состоянии инкрементальной разведки"""
+    if os.path.exists(alive_file):
+        for _ in state.filter_new('alive', iter_url_file(alive_file)):
+            pass
+
+def run_cached(ctx, tool, command, output_file):
+    """
+    Выполняет команду инструмента, результат которой зависит только от ее аргументов.
+    Свежий результат берется из кеша, успешный новый результат сохраняется в кеш.
+    """
+    cache = ctx['cache']
+    key = cache_key(tool, command)
+    if cache and cache.get_file(tool, key, output_file):
+        print_success(f"{tool}: результат взят из кеша")
+        return True
     
-    # Этап 1: Обнаружение поддоменов
-    time_tracker.start_stage("Поиск поддоменов")
-    print_status("Этап 1/7: Поиск поддоменов...")
-    subdomains_file = f"{dirs['subdomains']}/subdomains.txt"
     result = run_command_with_activity_monitor(
-        f"{TOOLS['subfinder']} -d {args.domain} -silent", 
-        subdomains_file,
-        activity_timeout=args.activity_timeout
+        command,
+        output_file,
+        timeout=ctx['timeout'],
+        activity_timeout=ctx['activity_timeout']
     )
-    
-    if not result or count_lines(subdomains_file) == 0:
-        print_error("Не удалось найти поддомены. Проверьте домен и доступность subfinder.")
-        time_tracker.end_stage("Поиск поддоменов")
-        time_tracker.end_total()
-        return
-    
+    if result and cache:
+        cache.put_file(tool, key, output_file)
+    return result
+
+def find_subdomains(ctx, inputs):
+    """Этап 1: обнаружение поддоменов"""
+    time_tracker.start_stage("Поиск поддоменов")
+    print_status("Этап 1/7: Поиск поддоменов...")
+    subdomains_file = f"{ctx['dirs']['subdomains']}/subdomains.txt"
+    result = run_cached(ctx, 'subfinder', f"{TOOLS['subfinder']} -d {ctx['domain']} -silent", subdomains_file)
     time_tracker.end_stage("Поиск поддоменов")
     
-    # Этап 2: Поиск живых поддоменов
+    if not result or count_lines(subdomains_file) == 0:
+        raise StageError("Не удалось найти поддомены. Проверьте домен и доступность subfinder.")
+    return {'subdomains_file': subdomains_file}
+
+def probe_alive(ctx, inputs):
+    """Этап 2: поиск живых поддоменов"""
     time_tracker.start_stage("Проверка живых поддоменов")
     print_status("Этап 2/7: Проверка живых поддоменов...")
-    alive_file = f"{dirs['subdomains']}/alive.txt"
-    result = run_command_with_activity_monitor(
-        f"cat {subdomains_file} | {TOOLS['httpx']} -p {PORTS} -t {THREADS} -silent -o {alive_file}",
-        activity_timeout=args.activity_timeout
-    )
+    alive_file = f"{ctx['dirs']['subdomains']}/alive.txt"
+    probe_file = inputs['subdomains_file']
     
-    if not result or count_lines(alive_file) == 0:
-        print_error("Не найдено живых поддоменов. Проверьте доступность хостов.")
-        time_tracker.end_stage("Проверка живых поддоменов")
-        time_tracker.end_total()
-        return
+    state = ctx['state']
+    if state:
+        # В инкрементальном режиме httpx проверяет только новые поддомены
+        probe_file = f"{ctx['dirs']['subdomains']}/new_subdomains.txt"
+        new_count = write_lines(state.filter_new('subdomains', iter_url_file(inputs['subdomains_file'])), probe_file)
+        print_status(f"Новых поддоменов: {new_count}")
+        if new_count == 0:
+            open(alive_file, 'w').close()
+            time_tracker.end_stage("Проверка живых поддоменов")
+            return {'alive_file': alive_file}
     
+    if ctx['cache']:
+        result = probe_alive_cached(ctx, probe_file, alive_file)
+    else:
+        result = run_command_with_activity_monitor(
+            f"cat {probe_file} | {TOOLS['httpx']} -p {PORTS} -t {THREADS} -silent -o {alive_file}",
+            timeout=ctx['timeout'],
+            activity_timeout=ctx['activity_timeout']
+        )
     time_tracker.end_stage("Проверка живых поддоменов")
     
-    # Этап 3: Сбор URL с помощью waybackurls
+    # В инкрементальном режиме отсутствие новых живых хостов - нормальная ситуация
+    if not result or (not state and count_lines(alive_file) == 0):
+        raise StageError("Не найдено живых поддоменов. Проверьте доступность хостов.")
+    if state:
+        record_alive(state, alive_file)
+    return {'alive_file': alive_file}
+
+def probe_alive_cached(ctx, probe_file, alive_file):
+    """
+    httpx с кешем по хостам: проверяются только хосты без свежего результата.
+    Результат для хоста - список живых URL на его портах (пустой, если хост не ответил).
+    """
+    cache = ctx['cache']
+    alive = []
+    to_probe = []
+    keys = {}
+    for host in iter_url_file(probe_file):
+        if not host:
+            continue
+        keys[host] = cache_key('httpx', PORTS, host)
+        cached = cache.get_lines('httpx', keys[host])
+        if cached is None:
+            to_probe.append(host)
+        else:
+            alive.extend(cached)
+    print_status(f"httpx: из кеша {len(keys) - len(to_probe)} хостов, проверяется {len(to_probe)}")
+    
+    result = True
+    if to_probe:
+        pending_file = f"{ctx['dirs']['subdomains']}/httpx_pending.txt"
+        probed_file = f"{ctx['dirs']['subdomains']}/httpx_probed.txt"
+        write_lines(to_probe, pending_file)
+        result = run_command_with_activity_monitor(
+            f"cat {pending_file} | {TOOLS['httpx']} -p {PORTS} -t {THREADS} -silent -o {probed_file}",
+            timeout=ctx['timeout'],
+            activity_timeout=ctx['activity_timeout']
+        )
+        if result:
+            # Раскладываем найденные URL по проверенным хостам
+            by_host = {host: [] for host in to_probe}
+            for url in iter_url_file(probed_file) if os.path.exists(probed_file) else []:
+                host = urlsplit(url).hostname
+                if host in by_host:
+                    by_host[host].append(url)
+                alive.append(url)
+            cache.put_lines_many('httpx', {keys[host]: urls for host, urls in by_host.items()})
+    
+    write_lines(alive, alive_file)
+    return result
+
+def collect_waybackurls(ctx, inputs):
+    """Этап 3: сбор URL с помощью waybackurls (зависит только от домена)"""
     time_tracker.start_stage("Сбор URL (waybackurls)")
     print_status("Этап 3/7: Сбор URL (waybackurls)...")
-    waybackurls_file = f"{dirs['waybackurls']}/waybackurls_urls.txt"
-    run_command_with_activity_monitor(
-        f"{TOOLS['waybackurls']} {args.domain}", 
-        waybackurls_file,
-        activity_timeout=args.activity_timeout
-    )
+    waybackurls_file = f"{ctx['dirs']['waybackurls']}/waybackurls_urls.txt"
+    run_cached(ctx, 'waybackurls', f"{TOOLS['waybackurls']} {ctx['domain']}", waybackurls_file)
     time_tracker.end_stage("Сбор URL (waybackurls)")
-    
-    # Этап 4: Сбор URL с помощью Katana
+    return {'waybackurls_file': waybackurls_file}
+
+def crawl_katana(ctx, inputs):
+    """Этап 4: сбор URL с помощью Katana"""
     time_tracker.start_stage("Сбор URL (katana)")
     print_status("Этап 4/7: Сбор URL (katana)...")
-    katana_file = f"{dirs['katana']}/katana_urls.txt"
+    katana_file = f"{ctx['dirs']['katana']}/katana_urls.txt"
+    if count_lines(inputs['alive_file']) == 0:
+        print_status("Нет живых хостов для обхода katana")
+        open(katana_file, 'w').close()
+        time_tracker.end_stage("Сбор URL (katana)")
+        return {'katana_file': katana_file}
     run_command_with_activity_monitor(
-        f"{TOOLS['katana']} -list {alive_file} -d {KATANA_DEPTH} -jc -fx -ef {BLACKLIST_EXT} -o {katana_file}",
-        activity_timeout=args.activity_timeout
+        f"{TOOLS['katana']} -list {inputs['alive_file']} -d {KATANA_DEPTH} -jc -fx -ef {BLACKLIST_EXT} -o {katana_file}",
+        timeout=ctx['timeout'],
+        activity_timeout=ctx['activity_timeout']
     )
     time_tracker.end_stage("Сбор URL (katana)")
-    
-    # Этап 5: Объединение и обработка URL
+    return {'katana_file': katana_file}
+
+def stream_recon(ctx, inputs):
+    """Этапы 1, 2 и 4 в потоковом режиме: subfinder -> httpx -> katana"""
+    time_tracker.start_stage("Потоковая разведка")
+    print_status("Этапы 1, 2, 4/7: Потоковая разведка...")
+    state = ctx['state']
+    is_new = partial(state.is_new, 'subdomains') if state else None
+    try:
+        result = StreamingRecon(ctx['domain'], ctx['dirs'], timeout=ctx['timeout'], is_new=is_new).run()
+        if state:
+            record_alive(state, result['alive_file'])
+        return result
+    finally:
+        time_tracker.end_stage("Потоковая разведка")
+
+def process_urls(ctx, inputs):
+    """Этап 5: объединение и обработка URL"""
     time_tracker.start_stage("Обработка URL")
     print_status("Этап 5/7: Обработка URL...")
+    dirs = ctx['dirs']
     all_urls_file = f"{dirs['urls']}/all_urls.txt"
+    url_store_file = f"{dirs['urls']}/{URL_STORE_FILE}"
     
-    # Объединение результатов только если файлы существуют и не пустые
-    waybackurls_exists = os.path.exists(waybackurls_file) and os.path.getsize(waybackurls_file) > 0
-    katana_exists = os.path.exists(katana_file) and os.path.getsize(katana_file) > 0
-    
-    if waybackurls_exists and katana_exists:
-        run_command_with_activity_monitor(
-            f"cat {waybackurls_file} {katana_file} | sort -u > {all_urls_file}",
-            activity_timeout=args.activity_timeout
-        )
-    elif waybackurls_exists:
-        run_command_with_activity_monitor(
-            f"cp {waybackurls_file} {all_urls_file}",
-            activity_timeout=args.activity_timeout
-        )
-    elif katana_exists:
-        run_command_with_activity_monitor(
-            f"cp {katana_file} {all_urls_file}",
-            activity_timeout=args.activity_timeout
-        )
-    else:
+    # Объединяем только существующие и непустые источники
+    sources = {
+        tool: path for tool, path in (('waybackurls', inputs['waybackurls_file']), ('katana', inputs['katana_file']))
+        if path and os.path.exists(path) and os.path.getsize(path) > 0
+    }
+    if not sources:
         print_error("Не удалось собрать URL. Создаем пустой файл.")
-        open(all_urls_file, 'w').close()
-    
-    # Поиск чувствительных файлов
-    if os.path.exists(all_urls_file) and os.path.getsize(all_urls_file) > 0:
-        sensitive_files = f"{dirs['urls']}/sensitive_files.txt"
-        run_command_with_activity_monitor(
-            f"grep -aE '{SENSITIVE_EXT}' {all_urls_file} > {sensitive_files}",
-            activity_timeout=args.activity_timeout
-        )
-        
-        # Поиск URL с параметрами
-        param_file = f"{dirs['urls']}/param_urls.txt"
-        run_command_with_activity_monitor(
-            f"grep -aF '=' {all_urls_file} | {TOOLS['sed']} 's/=.*/=/' | sort -u > {param_file}",
-            activity_timeout=args.activity_timeout
-        )
-        
-        # Специфичные категории URL
-        for ext, name in [("js$", "js_files.txt"), ("php$", "php_files.txt"), ("/api/", "api_endpoints.txt")]:
-            run_command_with_activity_monitor(
-                f"grep -a '{ext}' {all_urls_file} > {dirs['urls']}/{name}",
-                activity_timeout=args.activity_timeout
-            )
-    else:
-        print_error("Файл all_urls.txt пуст или не существует, пропускаем обработку URL")
-        # Создаем пустые файлы
-        for name in ["sensitive_files.txt", "param_urls.txt", "js_files.txt", "php_files.txt", "api_endpoints.txt"]:
-            open(f"{dirs['urls']}/{name}", 'w').close()
+    
+    # Источники загружаются в хранилище URL запуска: оно же дедуплицирует их на диске
+    # и один раз разбирает каждый URL. Каждый URL, впервые добавленный в хранилище, сразу
+    # записывается в all_urls.txt и классифицируется (один проход, без ожидания всех источников).
+    # В инкрементальном режиме дальше передаются только URL, не встречавшиеся в прошлых запусках
+    with UrlStore(url_store_file, reset=True) as store:
+        urls = (url for tool, path in sources.items() for url in store.insert_urls(iter_url_file(path), source=tool))
+        run_tag = None
+        if ctx['state']:
+            # В хранилище остаются и известные URL, поэтому новые помечаются для следующих этапов
+            urls = ctx['state'].filter_new('urls', urls)
+            run_tag = NEW_TAG
+            store.set_meta(INCREMENTAL)
+        counts = classify_urls(write_urls(urls, all_urls_file), dirs['urls'], store=store, run_tag=run_tag)
+    for name, count in counts.items():
+        print_status(f"{name}: {count}")
     
     time_tracker.end_stage("Обработка URL")
     
-    # Этап 6: Скачивание файлов
+    return {
+        'all_urls_file': all_urls_file,
+        'url_store_file': url_store_file,
+        'sensitive_urls_file': f"{dirs['urls']}/sensitive_files.txt",
+        'js_urls_file': f"{dirs['urls']}/js_files.txt",
+        'php_urls_file': f"{dirs['urls']}/php_files.txt"
+    }
+
+def download_files(ctx, inputs):
+    """Этап 6: скачивание sensitive, js и php файлов общим пулом соединений"""
     time_tracker.start_stage("Скачивание файлов")
     print_status("Этап 6/7: Скачивание файлов...")
-    
-    def download_files(file_type, urls_file, output_dir):
-        if os.path.exists(urls_file) and os.path.getsize(urls_file) > 0:
-            print_status(f"Скачивание {file_type} файлов...")
-            # Добавляем дополнительные параметры для лучшей обработки ошибок
-            run_command_with_activity_monitor(
-                f"{TOOLS['wget']} -q -i {urls_file} -P {output_dir} --timeout=10 --tries=1 --no-check-certificate --no-verbose --continue --restrict-file-names=windows",
-                activity_timeout=args.activity_timeout
-            )
+    categories = {}
+    for file_type in ['sensitive', 'js', 'php']:
+        urls_file = inputs[f'{file_type}_urls_file']
+        if urls_file and os.path.exists(urls_file) and os.path.getsize(urls_file) > 0:
+            categories[file_type] = (urls_file, ctx['dirs'][file_type])
         else:
             print_error(f"Файл {urls_file} пуст или не существует, пропускаем скачивание {file_type} файлов")
     
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        executor.submit(download_files, "sensitive", f"{dirs['urls']}/sensitive_files.txt", dirs['sensitive'])
-        executor.submit(download_files, "js", f"{dirs['urls']}/js_files.txt", dirs['js'])
-        executor.submit(download_files, "php", f"{dirs['urls']}/php_files.txt", dirs['php'])
-    
+    stats = download_url_files(categories, ctx['domain'])
+    for output_dir, dir_stats in stats.items():
+        print_status(
+            f"{output_dir}: скачано {dir_stats['downloaded']} (уникальных {dir_stats['unique']}), "
+            f"ошибок {dir_stats['failed']}, {dir_stats['bytes'] / (1024 * 1024):.1f} MB"
+        )
     time_tracker.end_stage("Скачивание файлов")
+    return {}
+
+def build_stages(ctx):
+    """Строит граф этапов разведки"""
+    scheduler = StageScheduler(max_workers=RECON_STAGE_WORKERS)
+    if ctx['stream']:
+        scheduler.add_stage("stream", partial(stream_recon, ctx),
+                            outputs=['subdomains_file', 'alive_file', 'katana_file'])
+    else:
+        scheduler.add_stage("subfinder", partial(find_subdomains, ctx), outputs=['subdomains_file'])
+        scheduler.add_stage("httpx", partial(probe_alive, ctx), inputs=['subdomains_file'], outputs=['alive_file'])
+        scheduler.add_stage("katana", partial(crawl_katana, ctx), inputs=['alive_file'],
+                            outputs=['katana_file'], required=False)
+    scheduler.add_stage("waybackurls", partial(collect_waybackurls, ctx),
+                        outputs=['waybackurls_file'], required=False)
+    scheduler.add_stage("process_urls", partial(process_urls, ctx),
+                        inputs=['waybackurls_file', 'katana_file'],
+                        outputs=['all_urls_file', 'url_store_file', 'sensitive_urls_file', 'js_urls_file',
+                                 'php_urls_file'])
+    scheduler.add_stage("download", partial(download_files, ctx),
+                        inputs=['sensitive_urls_file', 'js_urls_file', 'php_urls_file'], required=False)
+    return scheduler
+
+def write_new_items_section(report, state):
+    """Раздел отчета с данными, появившимися с прошлого запуска"""
+    limit = STATE_CONFIG['report_new_items']
+    titles = {'subdomains': "Новые поддомены", 'alive': "Новые живые хосты", 'urls': "Новые URL"}
+    
+    report.write("\n## Новое с прошлого запуска\n")
+    if state.previous_run is None:
+        report.write("Первый инкрементальный запуск: все данные считаются новыми.\n")
+    for kind, title in titles.items():
+        count = state.new_count(kind)
+        report.write(f"\n### {title}: {count} (всего известно: {state.known_count(kind)})\n")
+        for item in state.new_items(kind, limit=limit):
+            report.write(f"- `{item}`\n")
+        if count > limit:
+            report.write(f"- ... и еще {count - limit}\n")
+
+def run(domain, reports_dir=None, activity_timeout=60, timeout=300, stream=False, incremental=False,
+        use_cache=True, commit_state=True):
+    """
+    Выполняет разведку домена в текущем процессе.
+    Независимые этапы (например, waybackurls и subfinder) выполняются параллельно.
+    В потоковом режиме (stream=True) subfinder, httpx и katana соединены очередями.
+    В инкрементальном режиме (incremental=True) httpx и katana получают только новые поддомены,
+    а файлы URL содержат только URL, не встречавшиеся в прошлых запусках.
+    Результаты subfinder, waybackurls и httpx берутся из кеша, пока не истек их TTL
+    (use_cache=False отключает кеш; потоковый режим кеш не использует).
+    Состояние инкрементального режима сохраняется в конце разведки. При commit_state=False
+    оно не сохраняется и не закрывается, а возвращается открытым в result['state']:
+    вызывающий сохраняет его (commit) после успешной обработки URL следующими этапами
+    и закрывает (close), иначе новые URL будут обработаны в следующем запуске.
+    Возвращает словарь с директориями, путями к файлам, статистикой и путем к отчету.
+    При невозможности продолжить разведку выбрасывает StageError.
+    """
+    # Проверка инструментов
+    if not check_tools():
+        raise StageError("Отсутствуют инструменты для разведки")
+    
+    # Настройка рабочего пространства
+    time_tracker.start_stage("Настройка рабочего пространства")
+    dirs = setup_workspace(domain)
+    timestamp = get_timestamp()
+    time_tracker.end_stage("Настройка рабочего пространства")
+    
+    print_status(f"Начало разведки для {domain}")
+    print_status(f"Таймаут неактивности: {activity_timeout}с")
+    
+    state = ReconState(domain) if incremental else None
+    if state:
+        print_status(f"Инкрементальный режим, состояние: {state.path}")
+    
+    cache = ToolCache() if use_cache else None
+    
+    ctx = {
+        'domain': domain,
+        'dirs': dirs,
+        'timeout': timeout,
+        'activity_timeout': activity_timeout,
+        'stream': stream,
+        'state': state,
+        'cache': cache,
+        'commit_state': commit_state
+    }
+    
+    result = None
+    try:
+        result = _run_stages(ctx, reports_dir, timestamp)
+        return result
+    finally:
+        # Переданное вызывающему состояние закрывает он
+        if state and not (result and 'state' in result):
+            state.close()
+        if cache:
+            cache.close()
+
+def _run_stages(ctx, reports_dir, timestamp):
+    """Выполняет этапы разведки и формирует отчет"""
+    domain, dirs, state = ctx['domain'], ctx['dirs'], ctx['state']
+    
+    # Этапы 1-6 выполняются по графу зависимостей
+    time_tracker.start_stage("Сбор и обработка данных")
+    artifacts = build_stages(ctx).run()
+    time_tracker.end_stage("Сбор и обработка данных")
     
     # Этап 7: Генерация отчетов
     time_tracker.start_stage("Генерация отчетов")
     print_status("Этап 7/7: Генерация отчетов...")
     report_filename = f"recon_report_{timestamp}.md"
-    report_file = get_report_path('recon', args.domain, report_filename, args.reports_dir)
+    report_file = get_report_path('recon', domain, report_filename, reports_dir)
     
     with open(report_file, 'w', encoding='utf-8') as report:
-        report.write(f"# Отчет разведки: {args.domain}\n")
+        report.write(f"# Отчет разведки: {domain}\n")
         report.write(f"**Дата:** {timestamp}\n\n")
         
         # Статистика
@@ -224,6 +410,9 @@ def main():
             count = count_lines(file)
             report.write(f"- **{name}:** {count}\n")
         
+        if state:
+            write_new_items_section(report, state)
+        
         # Директории
         report.write("\n## Структура проекта\n")
         for dir_name, dir_path in dirs.items():
@@ -233,15 +422,75 @@ def main():
     
     print_success(f"Завершено! Отчет: {report_file}")
     
-    # Финальная статистика
-    subdomains_count = count_lines(f"{dirs['subdomains']}/subdomains.txt")
-    alive_count = count_lines(f"{dirs['subdomains']}/alive.txt")
-    urls_count = count_lines(f"{dirs['urls']}/all_urls.txt")
+    files = {
+        'subdomains': artifacts['subdomains_file'],
+        'alive': artifacts['alive_file'],
+        'waybackurls': artifacts['waybackurls_file'],
+        'katana': artifacts['katana_file'],
+        'all_urls': artifacts['all_urls_file'],
+        'url_store': artifacts['url_store_file'],
+        'sensitive_files': f"{dirs['urls']}/sensitive_files.txt",
+        'param_urls': f"{dirs['urls']}/param_urls.txt",
+        'js_files': f"{dirs['urls']}/js_files.txt",
+        'php_files': f"{dirs['urls']}/php_files.txt",
+        'api_endpoints': f"{dirs['urls']}/api_endpoints.txt"
+    }
+    
+    result = {
+        'domain': domain,
+        'dirs': dirs,
+        'files': files,
+        'counts': {
+            'subdomains': count_lines(files['subdomains']),
+            'alive': count_lines(files['alive']),
+            'urls': count_lines(files['all_urls'])
+        },
+        'report_file': report_file
+    }
+    
+    if state:
+        result['new'] = {kind: state.new_count(kind) for kind in ReconState.KINDS}
+        # Если источник URL не отработал, дельта не сохраняется и будет обработана в следующий раз
+        if artifacts['katana_file'] is None or artifacts['waybackurls_file'] is None:
+            print_error("Часть источников URL завершилась с ошибкой, состояние не обновлено")
+        elif ctx['commit_state']:
+            state.commit()
+        else:
+            result['state'] = state
+    
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='BagBountyAuto - Разведка домена')
+    parser.add_argument('domain', help='Target domain (e.g. example.com)')
+    parser.add_argument('--reports-dir', help='Директория для отчетов')
+    parser.add_argument('--activity-timeout', type=int, default=60, help='Таймаут неактивности в секундах (по умолчанию: 60)')
+    parser.add_argument('--stream', action='store_true', help='Потоковый режим: subfinder -> httpx -> katana без ожидания файлов')
+    parser.add_argument('--incremental', action='store_true', help='Обрабатывать только новые поддомены и URL с прошлого запуска')
+    parser.add_argument('--no-cache', action='store_true', help='Не использовать кеш результатов subfinder, waybackurls и httpx')
+    args = parser.parse_args()
     
+    # Начинаем общий отсчет времени для разведки
+    time_tracker.start_total()
+    
+    try:
+        result = run(args.domain, reports_dir=args.reports_dir, activity_timeout=args.activity_timeout,
+                     stream=args.stream, incremental=args.incremental, use_cache=not args.no_cache)
+    except StageError as e:
+        print_error(str(e))
+        time_tracker.end_total()
+        sys.exit(1)
+    
+    # Финальная статистика
     print_status("Всего собрано данных:")
-    print(f"  Поддомены: {subdomains_count}")
-    print(f"  Живые хосты: {alive_count}")
-    print(f"  URL: {urls_count}")
+    print(f"  Поддомены: {result['counts']['subdomains']}")
+    print(f"  Живые хосты: {result['counts']['alive']}")
+    print(f"  URL: {result['counts']['urls']}")
+    if 'new' in result:
+        print_status("Новое с прошлого запуска:")
+        print(f"  Поддомены: {result['new']['subdomains']}")
+        print(f"  Живые хосты: {result['new']['alive']}")
+        print(f"  URL: {result['new']['urls']}")
     
     # Показываем статистику времени выполнения
     time_tracker.print_summary()
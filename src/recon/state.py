@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Состояние инкрементальной разведки для BagBountyAuto
+Хранит поддомены, живые хосты и URL, найденные в прошлых запусках, чтобы
+обрабатывать только новые данные.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import threading
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from config.settings import STATE_CONFIG
+
+class ReconState:
+    """
+    Множества известных значений домена в SQLite (<dir>/<domain>.db).
+    Новые значения добавляются в транзакцию текущего запуска и сохраняются только
+    после commit(), поэтому прерванный запуск не теряет дельту.
+    """
+
+    KINDS = ('subdomains', 'alive', 'urls')
+
+    def __init__(self, domain, state_dir=None):
+        self.domain = domain
+        self.state_dir = state_dir or STATE_CONFIG['dir']
+        os.makedirs(self.state_dir, exist_ok=True)
+        self.path = os.path.join(self.state_dir, f"{domain}.db")
+        self.run_id = time.time()
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS items (
+                kind TEXT NOT NULL,
+                value TEXT NOT NULL,
+                run REAL NOT NULL,
+                PRIMARY KEY (kind, value)
+            ) WITHOUT ROWID
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS items_run ON items (run, kind)")
+        self._db.commit()
+
+        with self._lock:
+            self.previous_run = self._db.execute("SELECT MAX(run) FROM items").fetchone()[0]
+
+    def is_new(self, kind, value):
+        """Проверяет, встречалось ли значение раньше, и запоминает его"""
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO items (kind, value, run) VALUES (?, ?, ?)",
+                (kind, value, self.run_id)
+            )
+            return cursor.rowcount == 1
+
+    def filter_new(self, kind, values):
+        """Выдает только значения, не встречавшиеся в прошлых запусках (и ранее в этом)"""
+        for value in values:
+            if self.is_new(kind, value):
+                yield value
+
+    def new_count(self, kind):
+        """Количество новых значений в текущем запуске"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM items WHERE run = ? AND kind = ?", (self.run_id, kind)
+            ).fetchone()[0]
+
+    def new_items(self, kind, limit=None):
+        """Новые значения текущего запуска"""
+        query = "SELECT value FROM items WHERE run = ? AND kind = ? ORDER BY value"
+        params = [self.run_id, kind]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [row[0] for row in self._db.execute(query, params)]
+
+    def known_count(self, kind):
+        """Общее количество известных значений с учетом текущего запуска"""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM items WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def commit(self):
+        """Сохраняет новые значения текущего запуска"""
+        with self._lock:
+            self._db.commit()
+
+    def close(self):
+        """Закрывает базу; несохраненные значения отбрасываются"""
+        with self._lock:
+            self._db.rollback()
+            self._db.close()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Потоковый режим разведки для BagBountyAuto
+subfinder -> httpx -> katana соединены ограниченными очередями вместо файловых барьеров:
+каждый поддомен уходит в httpx сразу после обнаружения, каждый живой хост - в katana
+сразу после подтверждения httpx.
+"""
+
+import os
+import sys
+import time
+import queue
+import threading
+import subprocess
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.common import print_status, print_success, print_warning, StageError
+from src.utils.process_supervisor import supervisor, terminate_process_group
+from config.settings import (
+    TOOLS, PORTS, THREADS, KATANA_DEPTH, BLACKLIST_EXT, STREAM_QUEUE_SIZE, STREAM_KATANA_WORKERS
+)
+
+def _spawn(args, stdin=None):
+    """Запускает процесс в отдельной группе, чтобы его можно было завершить целиком"""
+    return subprocess.Popen(
+        args,
+        stdin=stdin,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        bufsize=1,
+        start_new_session=True
+    )
+
+class StreamingRecon:
+    """Конвейер subfinder -> httpx -> katana на ограниченных очередях"""
+
+    def __init__(self, domain, dirs, timeout=300, queue_size=STREAM_QUEUE_SIZE,
+                 katana_workers=STREAM_KATANA_WORKERS, is_new=None):
+        self.domain = domain
+        # is_new(host) решает, отправлять ли поддомен в httpx (инкрементальный режим)
+        self.is_new = is_new
+        self.subdomains_file = f"{dirs['subdomains']}/subdomains.txt"
+        self.alive_file = f"{dirs['subdomains']}/alive.txt"
+        self.katana_file = f"{dirs['katana']}/katana_urls.txt"
+        self.timeout = timeout
+        self.katana_workers = katana_workers
+
+        # Очереди ограничены: если следующий этап не успевает, предыдущий блокируется
+        self.subdomains_queue = queue.Queue(maxsize=queue_size)
+        self.alive_queue = queue.Queue(maxsize=queue_size)
+
+        # subfinder и httpx запускаются напрямую (вход httpx пишет конвейер),
+        # katana - через общий супервизор с крайним сроком конвейера
+        self.processes = []
+        self.processes_lock = threading.Lock()
+        self.katana_lock = threading.Lock()
+        # Устанавливается по таймауту конвейера: новые katana не запускаются
+        self.stop = threading.Event()
+        self.start_time = None
+        self.deadline = None
+        self.first_url_time = None
+        self.counts = {'subdomains': 0, 'alive': 0, 'urls': 0}
+
+    def _register(self, proc):
+        with self.processes_lock:
+            self.processes.append(proc)
+        return proc
+
+    def _read_subdomains(self, subfinder):
+        """Читает поддомены из subfinder и передает их в очередь httpx"""
+        seen = set()
+        try:
+            with open(self.subdomains_file, 'w') as f:
+                for line in subfinder.stdout:
+                    host = line.strip()
+                    if not host or host in seen:
+                        continue
+                    seen.add(host)
+                    f.write(f"{host}\n")
+                    f.flush()
+                    self.counts['subdomains'] += 1
+                    if self.is_new is None or self.is_new(host):
+                        self.subdomains_queue.put(host)
+        finally:
+            self.subdomains_queue.put(None)
+
+    def _feed_httpx(self, httpx):
+        """Передает поддомены из очереди на вход httpx"""
+        broken = False
+        while True:
+            host = self.subdomains_queue.get()
+            if host is None:
+                break
+            if broken:
+                # httpx завершился - продолжаем разбирать очередь, чтобы не блокировать subfinder
+                continue
+            try:
+                httpx.stdin.write(f"{host}\n")
+                httpx.stdin.flush()
+            except (BrokenPipeError, ValueError):
+                print_warning("httpx завершился раньше времени, оставшиеся поддомены пропущены")
+                broken = True
+        try:
+            httpx.stdin.close()
+        except (BrokenPipeError, ValueError):
+            pass
+
+    def _read_alive(self, httpx):
+        """Читает живые хосты из httpx и передает их в очередь katana"""
+        try:
+            with open(self.alive_file, 'w') as f:
+                for line in httpx.stdout:
+                    url = line.strip()
+                    if not url:
+                        continue
+                    f.write(f"{url}\n")
+                    f.flush()
+                    self.counts['alive'] += 1
+                    if not self.stop.is_set():
+                        self.alive_queue.put(url)
+        finally:
+            for _ in range(self.katana_workers):
+                self.alive_queue.put(None)
+
+    def _write_urls(self, lines, katana_output):
+        """Записывает строки вывода katana в общий файл URL"""
+        with self.katana_lock:
+            for line in lines:
+                found = line.decode('utf-8', 'replace').strip()
+                if not found:
+                    continue
+                if self.first_url_time is None:
+                    self.first_url_time = time.time()
+                    print_success(f"Первый URL получен через {self.first_url_time - self.start_time:.1f}с")
+                katana_output.write(f"{found}\n")
+                self.counts['urls'] += 1
+
+    def _crawl_host(self, url, katana_output):
+        """Обходит один хост katana под супервизором; процесс завершается к сроку конвейера"""
+        remaining = self.deadline - time.time()
+        if remaining <= 0:
+            return
+        pending = bytearray()
+
+        def sink(data):
+            # Вывод приходит частями: в файл уходят только завершенные строки
+            pending.extend(data)
+            *lines, rest = pending.split(b'\n')
+            pending[:] = rest
+            self._write_urls(lines, katana_output)
+
+        job = supervisor.run(
+            [TOOLS['katana'], '-u', url, '-d', str(KATANA_DEPTH), '-jc', '-fx', '-ef', BLACKLIST_EXT, '-silent'],
+            timeout=remaining, activity_timeout=None, sink=sink
+        )
+        self._write_urls([pending], katana_output)
+        if job.reason:
+            print_warning(f"katana прерван ({job.reason}): {url}")
+
+    def _crawl(self, katana_output):
+        """
+        Обходит живые хосты katana по мере их поступления. Очередь разбирается до
+        маркера конца и после таймаута или ошибки обхода, чтобы не блокировать _read_alive.
+        """
+        while True:
+            url = self.alive_queue.get()
+            if url is None:
+                return
+            if self.stop.is_set():
+                continue
+            try:
+                self._crawl_host(url, katana_output)
+            except Exception as e:
+                print_warning(f"Ошибка обхода katana {url}: {e}")
+
+    def _drain_alive(self):
+        """Удаляет из очереди katana необработанные хосты, сохраняя маркеры конца"""
+        markers = 0
+        while True:
+            try:
+                item = self.alive_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                markers += 1
+        for _ in range(markers):
+            self.alive_queue.put(None)
+
+    def _stop(self):
+        """Таймаут конвейера: новые обходы не начинаются, subfinder и httpx завершаются"""
+        print_warning(f"Таймаут потоковой разведки ({self.timeout}с), конвейер останавливается")
+        self.stop.set()
+        with self.processes_lock:
+            for proc in self.processes:
+                terminate_process_group(proc)
+        self._drain_alive()
+
+    def run(self):
+        """
+        Выполняет конвейер и возвращает пути к файлам поддоменов, живых хостов и URL katana.
+        Если не найдено ни одного поддомена или живого хоста, выбрасывает StageError
+        (в инкрементальном режиме отсутствие новых живых хостов не является ошибкой).
+        """
+        self.start_time = time.time()
+        self.deadline = self.start_time + self.timeout
+        print_status(f"Потоковая разведка: subfinder -> httpx -> katana ({self.katana_workers} обходчиков)")
+
+        subfinder = self._register(_spawn(
+            [TOOLS['subfinder'], '-d', self.domain, '-silent'], stdin=subprocess.DEVNULL
+        ))
+        httpx = self._register(_spawn(
+            [TOOLS['httpx'], '-p', PORTS, '-t', str(THREADS), '-silent', '-stream'],
+            stdin=subprocess.PIPE
+        ))
+
+        # Общий таймаут на весь конвейер
+        watchdog = threading.Timer(self.timeout, self._stop)
+        watchdog.daemon = True
+        watchdog.start()
+
+        with open(self.katana_file, 'w') as katana_output:
+            threads = [
+                threading.Thread(target=self._read_subdomains, args=(subfinder,), daemon=True),
+                threading.Thread(target=self._feed_httpx, args=(httpx,), daemon=True),
+                threading.Thread(target=self._read_alive, args=(httpx,), daemon=True)
+            ]
+            threads += [
+                threading.Thread(target=self._crawl, args=(katana_output,), daemon=True)
+                for _ in range(self.katana_workers)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        watchdog.cancel()
+        subfinder.wait()
+        httpx.wait()
+
+        print_success(
+            f"Потоковая разведка завершена за {time.time() - self.start_time:.1f}с: "
+            f"поддомены {self.counts['subdomains']}, живые {self.counts['alive']}, URL {self.counts['urls']}"
+        )
+
+        if self.counts['subdomains'] == 0:
+            raise StageError("Не удалось найти поддомены. Проверьте домен и доступность subfinder.")
+        if self.counts['alive'] == 0 and self.is_new is None:
+            raise StageError("Не найдено живых поддоменов. Проверьте доступность хостов.")
+
+        return {
+            'subdomains_file': self.subdomains_file,
+            'alive_file': self.alive_file,
+            'katana_file': self.katana_file
+        }
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Обработка собранных URL для BagBountyAuto
+Запись объединенных URL и классификация по категориям за один проход
+"""
+
+import os
+import re
+import sys
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from config.settings import URL_CATEGORIES, PARAM_URLS_FILE
+
+# Паттерны категорий компилируются один раз при импорте
+CATEGORY_PATTERNS = [(name, re.compile(pattern)) for name, pattern in URL_CATEGORIES.items()]
+
+# Количество меток категорий, накапливаемых перед записью в хранилище URL
+TAG_BATCH_SIZE = 10_000
+
+# Кодировка для файлов URL: суррогаты сохраняют произвольные байты без потерь, как grep -a
+URL_FILE_ENCODING = {'encoding': 'utf-8', 'errors': 'surrogateescape'}
+
+def iter_url_file(path):
+    """Построчно читает файл URL без символов конца строки"""
+    with open(path, 'r', newline='', **URL_FILE_ENCODING) as f:
+        for line in f:
+            yield line.rstrip('\r\n')
+
+def write_urls(urls, path):
+    """Записывает URL в файл и передает их дальше по конвейеру"""
+    with open(path, 'w', **URL_FILE_ENCODING) as f:
+        for url in urls:
+            f.write(f"{url}\n")
+            yield url
+
+def category_tag(name):
+    """Метка категории в хранилище URL: имя файла без расширения"""
+    return os.path.splitext(name)[0]
+
+def classify_urls(urls, output_dir, store=None, run_tag=None):
+    """
+    Раскладывает URL по файлам категорий за один проход.
+    urls - итерируемый источник URL (например, iter_url_file), читается ровно один раз.
+    URL с параметрами обрезаются после первого '=' и дедуплицируются.
+    Если передано хранилище URL (UrlStore), категории записываются и в него метками,
+    а каждый URL дополнительно помечается run_tag, если она задана (run_tag без
+    хранилища - ValueError).
+    Возвращает словарь {имя файла: количество записанных строк}.
+    """
+    if run_tag is not None and store is None:
+        raise ValueError("run_tag задается только вместе с хранилищем URL (store)")
+    counts = {name: 0 for name, _ in CATEGORY_PATTERNS}
+    counts[PARAM_URLS_FILE] = 0
+    seen_params = set()
+    tags = {name: category_tag(name) for name, _ in CATEGORY_PATTERNS}
+    tag_pairs = []
+
+    handles = {}
+    try:
+        for name in counts:
+            handles[name] = open(os.path.join(output_dir, name), 'w', **URL_FILE_ENCODING)
+        param_handle = handles[PARAM_URLS_FILE]
+
+        for url in urls:
+            if not url:
+                continue
+            if run_tag is not None:
+                tag_pairs.append((run_tag, url))
+
+            for name, pattern in CATEGORY_PATTERNS:
+                if pattern.search(url):
+                    handles[name].write(f"{url}\n")
+                    counts[name] += 1
+                    if store is not None:
+                        tag_pairs.append((tags[name], url))
+
+            eq = url.find('=')
+            if eq != -1:
+                template = url[:eq + 1]
+                if template not in seen_params:
+                    seen_params.add(template)
+                    param_handle.write(f"{template}\n")
+                    counts[PARAM_URLS_FILE] += 1
+
+            if len(tag_pairs) >= TAG_BATCH_SIZE:
+                store.add_tag_pairs(tag_pairs)
+                tag_pairs = []
+        if tag_pairs:
+            store.add_tag_pairs(tag_pairs)
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+    return counts
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Проверка параметров URL ручными payloads для BagBountyAuto
+Все запросы выполняются в одном процессе через AsyncHTTPClient: keep-alive пулы по хостам,
+общий лимит одновременных запросов, таймауты и ограничение частоты по хостам. Для каждого
+ответа сохраняются статус, размер, время и фрагмент тела; отражение payload и сигнатуры
+ошибок проверяются сразу.
+"""
+
+import os
+import re
+import sys
+import asyncio
+from urllib.parse import urlsplit, urlunsplit, quote
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils.http_client import AsyncHTTPClient
+from src.utils.rate_limiter import HostRateLimiter
+from config.settings import PAYLOAD_CONFIG
+
+# Сигнатуры в теле ответа, указывающие на срабатывание payload
+PAYLOAD_SIGNATURES = {
+    'sqli': re.compile(
+        r"SQL syntax|mysql_fetch|mysqli?_|ORA-\d{5}|PostgreSQL.*ERROR|pg_query|SQLite3?::|"
+        r"SQLSTATE|Unclosed quotation mark|syntax error at or near|ODBC .*Driver",
+        re.I
+    ),
+    'lfi': re.compile(r"root:x:0:0:|\[boot loader\]|Linux version \d|# localhost name resolution"),
+    'ssrf': re.compile(r"ami-id|instance-id|SSH-\d\.\d|mysql_native_password|STAT pid"),
+}
+
+def payload_cases(url, payloads, per_type=None):
+    """
+    Варианты URL с подставленным payload: по одному на параметр, тип уязвимости и payload.
+    Остальные параметры и их порядок сохраняются. Выдает (параметр, тип, payload, URL).
+    """
+    per_type = per_type or PAYLOAD_CONFIG['payloads_per_type']
+    parts = urlsplit(url)
+    if not parts.query:
+        return
+    pairs = [pair.partition('=') for pair in parts.query.split('&')]
+    for index, (name, eq, _) in enumerate(pairs):
+        if not name or not eq:
+            continue
+        for vuln_type, type_payloads in payloads.items():
+            for payload in type_payloads[:per_type]:
+                query = "&".join(
+                    f"{other}={quote(payload, safe='') if i == index else value}" if other_eq else other
+                    for i, (other, other_eq, value) in enumerate(pairs)
+                )
+                yield name, vuln_type, payload, urlunsplit(parts._replace(query=query))
+
+def evaluate(vuln_type, payload, response, baseline_text):
+    """
+    Признаки срабатывания payload: отражение в теле, сигнатура ошибки, которой нет в
+    исходном ответе, или редирект на адрес из payload. Возвращает список признаков.
+    """
+    findings = []
+    text = response.body.decode('utf-8', 'replace')
+    if payload in text:
+        findings.append('reflected')
+    signature = PAYLOAD_SIGNATURES.get(vuln_type)
+    if signature:
+        match = signature.search(text)
+        if match and not signature.search(baseline_text):
+            findings.append(f"signature: {match.group(0)}")
+    location = response.headers.get('location', '')
+    if vuln_type == 'open_redirect' and location and (location.startswith(payload) or 'evil.com' in location):
+        findings.append(f"redirect: {location}")
+    return findings
+
+async def _test_url(client, url, payloads, config):
+    """Исходный запрос и все варианты payload одного URL"""
+    capture = config['capture_bytes']
+    baseline = await client.request(url, capture=capture)
+    baseline_text = baseline.body.decode('utf-8', 'replace')
+
+    cases = list(payload_cases(url, payloads, config['payloads_per_type']))
+    responses = await asyncio.gather(*(client.request(test_url, capture=capture) for *_, test_url in cases))
+
+    results = []
+    for (parameter, vuln_type, payload, test_url), response in zip(cases, responses):
+        if not response.ok or response.status == 404:
+            continue
+        results.append({
+            'url': test_url,
+            'parameter': parameter,
+            'payload': payload,
+            'vuln_type': vuln_type,
+            'status_code': str(response.status),
+            'length': response.length,
+            'baseline_status': baseline.status,
+            'baseline_length': baseline.length,
+            'elapsed': round(response.elapsed, 3),
+            'findings': evaluate(vuln_type, payload, response, baseline_text),
+            'snippet': response.body[:config['snippet_bytes']].decode('utf-8', 'replace')
+        })
+    return results
+
+async def test_payloads_async(urls, payloads, config=None, rate_limiter=None):
+    """
+    Проверяет все URL одним клиентом; результаты в порядке URL и вариантов.
+    rate_limiter - общий для этапа HostRateLimiter (по умолчанию создается свой).
+    """
+    config = {**PAYLOAD_CONFIG, **(config or {})}
+    # Редиректы не выполняются: для open redirect важен сам заголовок Location
+    async with AsyncHTTPClient(
+        max_connections=config['max_connections'],
+        max_per_host=config['max_per_host'],
+        timeout=config['timeout'],
+        max_redirects=0,
+        rate_limiter=rate_limiter or HostRateLimiter()
+    ) as client:
+        per_url = await asyncio.gather(*(_test_url(client, url, payloads, config) for url in urls))
+    return [result for results in per_url for result in results]
+
+def test_payloads(urls, payloads, config=None, rate_limiter=None):
+    """Синхронная обертка над test_payloads_async"""
+    return asyncio.run(test_payloads_async(urls, payloads, config, rate_limiter))
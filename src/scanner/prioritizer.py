@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Очередь URL для активного сканирования в порядке приоритета для BagBountyAuto
+Оценка URL складывается из признаков анализатора (параметры sqli/xss/lfi/ssrf...),
+тегов хоста (admin, dev, internal...), ответа httpx (живой ли хост), расширения и числа
+параметров. URL повторяющейся формы понижаются по мере выбора, поэтому бюджет
+сканирования расходуется на разные точки входа, а не на копии одной.
+"""
+
+import os
+import sys
+import time
+import heapq
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.analyze.analyze import match_url, subdomain_tags
+from src.filter.filter_recon import url_shape
+from src.utils.url_store import parse_url
+from src.utils.rate_limiter import url_host
+from config.settings import SCAN_PRIORITY
+
+def load_alive_hosts(recon_dir):
+    """Хосты, ответившие httpx при разведке; None, если проверки не было"""
+    alive_file = os.path.join(recon_dir, 'subdomains', 'alive.txt')
+    if not os.path.exists(alive_file):
+        return None
+    with open(alive_file, 'r', errors='replace') as f:
+        return {url_host(line.strip()) for line in f if line.strip()}
+
+def score_url(url, domain=None, alive_hosts=None, weights=SCAN_PRIORITY):
+    """Оценка URL и список причин вида 'sqli:id=1', 'host:admin', 'alive'"""
+    score = 0.0
+    reasons = []
+    for vuln_type, item in match_url(url):
+        weight = weights['vuln_weights'].get(vuln_type, 0)
+        if weight:
+            score += weight
+            reasons.append(f"{vuln_type}:{item.get('parameter', '')}")
+
+    host, _, ext, params = parse_url(url)
+    for tag in subdomain_tags(host, domain):
+        weight = weights['host_tag_weights'].get(tag, 0)
+        if weight:
+            score += weight
+            reasons.append(f"host:{tag}")
+
+    if alive_hosts is not None:
+        if host in alive_hosts:
+            score += weights['alive_bonus']
+            reasons.append('alive')
+        else:
+            score += weights['not_alive_penalty']
+            reasons.append('not_alive')
+
+    if ext in weights['dynamic_extensions']:
+        score += weights['dynamic_extension_bonus']
+        reasons.append(f"ext:{ext}")
+
+    if params:
+        score += min(weights['param_bonus'] * len(params), weights['max_param_bonus'])
+    return score, reasons
+
+class ScanQueue:
+    """
+    Очередь URL по убыванию оценки. URL одной формы лежат в отдельной куче формы, а в
+    общей куче - только лучший URL каждой формы с понижением за уже выбранные URL формы.
+    Запись общей кучи хранит, сколько URL формы было выбрано к моменту ее добавления:
+    записи, сделанные до выбора очередного URL формы, считаются устаревшими.
+    """
+
+    def __init__(self, shape_penalty=SCAN_PRIORITY['shape_repeat_penalty']):
+        self.shape_penalty = shape_penalty
+        self._heap = []
+        self._shapes = {}
+        self._taken = {}
+        self._seq = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _push_shape(self, shape):
+        """Добавляет в общую кучу лучший URL формы с учетом понижения"""
+        neg_score, seq = self._shapes[shape][0][:2]
+        penalty = self.shape_penalty * self._taken.get(shape, 0)
+        heapq.heappush(self._heap, (neg_score + penalty, seq, shape, self._taken.get(shape, 0)))
+
+    def push(self, url, score, reasons=()):
+        shape = url_shape(url)
+        entries = self._shapes.setdefault(shape, [])
+        seq = self._seq
+        heapq.heappush(entries, (-score, seq, url, list(reasons)))
+        self._seq += 1
+        self._size += 1
+        if entries[0][1] == seq:
+            self._push_shape(shape)
+
+    def pop(self):
+        """Следующий URL: (url, оценка с понижением, причины). IndexError, если очередь пуста"""
+        while True:
+            neg_score, seq, shape, taken = heapq.heappop(self._heap)
+            entries = self._shapes.get(shape)
+            # Устаревшая запись: лучший URL формы уже извлечен или сменился,
+            # либо запись добавлена без понижения за выбранные после нее URL формы
+            if entries and entries[0][1] == seq and self._taken.get(shape, 0) == taken:
+                break
+        _, _, url, reasons = heapq.heappop(entries)
+        self._size -= 1
+        self._taken[shape] = taken + 1
+        if entries:
+            self._push_shape(shape)
+        else:
+            del self._shapes[shape]
+        if taken:
+            reasons = reasons + [f"shape_repeat:{taken}"]
+        return url, -neg_score, reasons
+
+    def take(self, limit=None):
+        """Извлекает до limit URL в порядке приоритета"""
+        result = []
+        while self._size and (limit is None or len(result) < limit):
+            result.append(self.pop())
+        return result
+
+def build_scan_queue(urls, recon_dir, domain=None):
+    """Оценивает URL с параметрами и складывает их в ScanQueue"""
+    alive_hosts = load_alive_hosts(recon_dir)
+    queue = ScanQueue()
+    for url in urls:
+        score, reasons = score_url(url, domain, alive_hosts)
+        queue.push(url, score, reasons)
+    return queue
+
+class ScanBudget:
+    """
+    Бюджет этапа сканирования: общее время (для всех заданий) и число запросов
+    (для заданий, которые считают свои запросы). None - без ограничения.
+    """
+
+    def __init__(self, max_seconds=None, max_requests=None):
+        self.deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+        self.requests_left = max_requests
+
+    @property
+    def expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def remaining_seconds(self, default=None):
+        """Оставшееся время в секундах (default без ограничения)"""
+        if self.deadline is None:
+            return default
+        return max(0, self.deadline - time.monotonic())
+
+    def spend(self, requests):
+        """Списывает запросы. False, если бюджет исчерпан по времени или числу запросов"""
+        if self.expired:
+            return False
+        if self.requests_left is None:
+            return True
+        if requests > self.requests_left:
+            return False
+        self.requests_left -= requests
+        return True
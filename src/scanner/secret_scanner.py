@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Поиск секретов по SECRET_PATTERNS для BagBountyAuto
+Паттерны компилируются один раз, файлы читаются через mmap в пуле процессов. Находки
+(файл, смещение, паттерн, энтропия) пишутся в JSONL. Результаты сохраняются по хешу содержимого: файл, содержимое
+которого уже проверялось с теми же паттернами, повторно не сканируется.
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import mmap
+import bisect
+import sqlite3
+import hashlib
+import threading
+import multiprocessing
+from collections import Counter
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from config.settings import SECRET_PATTERNS, SECRET_SCAN_CONFIG
+
+def compile_patterns(patterns):
+    """
+    Выражения по байтам [(имя, выражение)] в порядке приоритета.
+    Каждый паттерн ищется своим проходом: в общем выражении через | re теряет поиск по
+    литеральному префиксу (AKIA, ghp_, -----BEGIN) и работает примерно в 4 раза медленнее.
+    """
+    return [(name, re.compile(pattern.encode())) for name, pattern in patterns.items()]
+
+SECRET_MATCHERS = compile_patterns(SECRET_PATTERNS)
+
+# Отпечаток настроек поиска: при изменении паттернов или порогов сохраненные результаты не используются
+PATTERNS_FINGERPRINT = hashlib.sha256(json.dumps(
+    [SECRET_PATTERNS, SECRET_SCAN_CONFIG['min_entropy'], SECRET_SCAN_CONFIG['match_bytes']],
+    sort_keys=True
+).encode()).hexdigest()
+
+def shannon_entropy(data):
+    """Энтропия Шеннона в битах на символ"""
+    if not data:
+        return 0.0
+    length = len(data)
+    return -sum(count / length * math.log2(count / length) for count in Counter(data).values())
+
+def file_sha256(path):
+    """SHA-256 содержимого файла"""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+def scan_file(path, config=SECRET_SCAN_CONFIG):
+    """
+    Находки в одном файле: список словарей offset, pattern, match, entropy по смещению.
+    Совпадение, пересекающееся с уже принятым совпадением паттерна с большим приоритетом,
+    отбрасывается (ghp_... - github_token, а не api_key).
+    """
+    findings = []
+    # Начала и концы принятых совпадений, отсортированные по началу (не пересекаются)
+    starts = []
+    ends = []
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return findings
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for pattern, regex in SECRET_MATCHERS:
+                min_entropy = config['min_entropy'].get(pattern, 0)
+                for match in regex.finditer(data):
+                    start, end = match.span()
+                    index = bisect.bisect_right(starts, start)
+                    if (index and ends[index - 1] > start) or (index < len(starts) and starts[index] < end):
+                        continue
+                    value = match.group()
+                    entropy = shannon_entropy(value)
+                    if entropy < min_entropy:
+                        continue
+                    starts.insert(index, start)
+                    ends.insert(index, end)
+                    findings.append({
+                        'offset': start,
+                        'pattern': pattern,
+                        'match': value[:config['match_bytes']].decode('utf-8', 'replace'),
+                        'entropy': round(entropy, 3)
+                    })
+    findings.sort(key=lambda finding: finding['offset'])
+    return findings
+
+def _scan_task(task):
+    """Задание пула: (хеш, путь) -> (хеш, находки или текст ошибки)"""
+    sha256, path = task
+    try:
+        return sha256, scan_file(path)
+    except (OSError, ValueError) as e:
+        return sha256, f"{type(e).__name__}: {e}"
+
+class SecretIndex:
+    """Находки по хешу содержимого (SQLite), общие для всех запусков и доменов"""
+
+    def __init__(self, path=None):
+        self.path = path or SECRET_SCAN_CONFIG['index_file']
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS scanned (
+                sha256 TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                findings TEXT NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, sha256):
+        """Сохраненные находки содержимого или None, если оно не проверялось с текущими паттернами"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT findings FROM scanned WHERE sha256 = ? AND fingerprint = ?",
+                (sha256, PATTERNS_FINGERPRINT)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, sha256, findings):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO scanned (sha256, fingerprint, findings) VALUES (?, ?, ?)",
+                (sha256, PATTERNS_FINGERPRINT, json.dumps(findings, ensure_ascii=False))
+            )
+
+    def commit(self):
+        with self._lock:
+            self._db.commit()
+
+def scan_secrets(targets, output_file, labels=None, hashes=None, workers=None, index_path=None):
+    """
+    Ищет секреты в файлах targets и пишет находки в output_file (JSONL).
+    labels - {путь: подпись} (URL для объектов хранилища), hashes - уже известные
+    хеши содержимого {путь: sha256}, остальные вычисляются.
+    Каждое содержимое сканируется один раз; ранее проверенное берется из индекса.
+    Возвращает сводку: files, scanned, cached, errors, findings.
+    """
+    labels = labels or {}
+    hashes = hashes or {}
+    workers = workers or SECRET_SCAN_CONFIG['workers']
+    summary = {'files': 0, 'scanned': 0, 'cached': 0, 'errors': 0, 'findings': 0}
+
+    # Пути по хешу содержимого: одинаковые файлы сканируются один раз
+    paths_by_hash = {}
+    for path in targets:
+        sha256 = hashes.get(path)
+        if sha256 is None:
+            try:
+                sha256 = file_sha256(path)
+            except OSError as e:
+                print(f"[-] Не удалось прочитать {path}: {e}")
+                summary['errors'] += 1
+                continue
+        paths_by_hash.setdefault(sha256, []).append(path)
+        summary['files'] += 1
+
+    with SecretIndex(index_path) as index, open(output_file, 'w', encoding='utf-8') as out:
+
+        def emit(sha256, findings):
+            for path in paths_by_hash[sha256]:
+                for finding in findings:
+                    out.write(json.dumps({
+                        'file': labels.get(path, path),
+                        'path': path,
+                        'sha256': sha256,
+                        **finding
+                    }, ensure_ascii=False) + "\n")
+                    summary['findings'] += 1
+
+        pending = []
+        for sha256, paths in paths_by_hash.items():
+            findings = index.get(sha256)
+            if findings is None:
+                pending.append((sha256, paths[0]))
+            else:
+                summary['cached'] += 1
+                emit(sha256, findings)
+
+        if pending:
+            if workers > 1 and len(pending) > 1:
+                pool = multiprocessing.Pool(min(workers, len(pending)))
+                results = pool.imap_unordered(_scan_task, pending, chunksize=4)
+            else:
+                pool = None
+                results = map(_scan_task, pending)
+            try:
+                for sha256, findings in results:
+                    if isinstance(findings, str):
+                        print(f"[-] Ошибка сканирования {paths_by_hash[sha256][0]}: {findings}")
+                        summary['errors'] += 1
+                        continue
+                    index.put(sha256, findings)
+                    summary['scanned'] += 1
+                    emit(sha256, findings)
+            finally:
+                if pool is not None:
+                    pool.close()
+                    pool.join()
+            index.commit()
+
+    return summary
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Хранилище скачанных файлов по хешу содержимого для BagBountyAuto
+Одинаковые тела ответов хранятся один раз, индекс URL -> хеш общий для всех запусков и доменов.
+"""
+
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from config.settings import BLOB_STORE_CONFIG
+
+class BlobWriter:
+    """
+    Потоковая запись тела во временный файл с одновременным подсчетом хеша.
+    Файл создается при первой записи, чтобы ожидающие загрузки не держали дескрипторы.
+    """
+
+    def __init__(self, tmp_dir):
+        self.tmp_dir = tmp_dir
+        self.path = None
+        self.handle = None
+        self.hasher = hashlib.sha256()
+        self.size = 0
+
+    def _open(self):
+        fd, self.path = tempfile.mkstemp(prefix='blob-', suffix='.part', dir=self.tmp_dir)
+        self.handle = os.fdopen(fd, 'wb')
+
+    def write(self, chunk):
+        if self.handle is None:
+            self._open()
+        self.handle.write(chunk)
+        self.hasher.update(chunk)
+        self.size += len(chunk)
+
+    def close(self):
+        if self.handle is None:
+            # Пустое тело тоже является объектом
+            self._open()
+        self.handle.close()
+
+    def discard(self):
+        if self.handle is not None:
+            self.handle.close()
+            os.remove(self.path)
+
+class BlobStore:
+    """
+    Хранилище вида <root>/objects/ab/cdef... с индексом в SQLite.
+    Индекс хранит, с какого URL (домен, категория) и когда было получено каждое тело.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or BLOB_STORE_CONFIG['dir']
+        self.objects_dir = os.path.join(self.root, 'objects')
+        self.tmp_dir = os.path.join(self.root, 'tmp')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(self.root, 'index.db'), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                category TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (url, domain, category)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS urls_sha256 ON urls (sha256)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS urls_domain ON urls (domain, category)")
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def blob_path(self, sha256):
+        """Путь к объекту по его хешу"""
+        return os.path.join(self.objects_dir, sha256[:2], sha256[2:])
+
+    def writer(self):
+        """Создает BlobWriter для потоковой записи нового тела"""
+        return BlobWriter(self.tmp_dir)
+
+    def commit(self, writer):
+        """
+        Перемещает записанное тело в хранилище.
+        Если такое содержимое уже есть, временный файл удаляется. Возвращает хеш.
+        """
+        writer.close()
+        sha256 = writer.hasher.hexdigest()
+        path = self.blob_path(sha256)
+        if os.path.exists(path):
+            os.remove(writer.path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # mkstemp создает файл с правами 0600, объекты доступны на чтение как обычные загрузки
+            os.chmod(writer.path, 0o644)
+            os.replace(writer.path, path)
+        return sha256
+
+    def record(self, url, sha256, size, domain, category):
+        """Запоминает, что URL вернул тело с данным хешем"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO urls (url, domain, category, sha256, size, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, domain, category, sha256, size, time.time())
+            )
+            self._db.commit()
+
+    def link(self, sha256, target_path):
+        """Делает объект доступным по обычному пути (жесткая ссылка, иначе копия)"""
+        if os.path.exists(target_path):
+            os.remove(target_path)
+        try:
+            os.link(self.blob_path(sha256), target_path)
+        except OSError:
+            shutil.copyfile(self.blob_path(sha256), target_path)
+
+    def blobs(self, domain=None, category=None):
+        """Уникальные хеши объектов, полученных для домена и/или категории"""
+        query = "SELECT DISTINCT sha256 FROM urls"
+        conditions, params = [], []
+        if domain:
+            conditions.append("domain = ?")
+            params.append(domain)
+        if category:
+            conditions.append("category = ?")
+            params.append(category)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            return [row[0] for row in self._db.execute(query, params)]
+
+    def urls_for(self, sha256):
+        """URL, с которых было получено тело с данным хешем"""
+        with self._lock:
+            return [row[0] for row in self._db.execute(
+                "SELECT DISTINCT url FROM urls WHERE sha256 = ?", (sha256,)
+            )]
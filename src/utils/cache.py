@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Кеш результатов внешних инструментов для BagBountyAuto
+Результаты хранятся на диске с отдельным временем жизни для каждого инструмента
+и вытесняются по давности использования при превышении размера.
+"""
+
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from config.settings import CACHE_CONFIG
+
+def cache_key(tool, *parts):
+    """Ключ записи: хеш имени инструмента и его аргументов"""
+    raw = "\0".join([tool, *[str(part) for part in parts]])
+    return hashlib.sha256(raw.encode('utf-8', 'surrogateescape')).hexdigest()
+
+class ToolCache:
+    """
+    Кеш вида <root>/files/ab/cdef... с индексом в SQLite.
+    Большие результаты (списки поддоменов, URL) хранятся файлами, маленькие
+    (результат httpx для одного хоста) - строками прямо в индексе.
+    Свежесть проверяется по TTL инструмента из настроек в момент чтения.
+    """
+
+    def __init__(self, root=None, max_size_mb=None, ttl=None):
+        self.root = root or CACHE_CONFIG['dir']
+        self.max_size = (max_size_mb or CACHE_CONFIG['max_size_mb']) * 1024 * 1024
+        self.ttl = ttl or CACHE_CONFIG['ttl']
+        self.files_dir = os.path.join(self.root, 'files')
+        os.makedirs(self.files_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(self.root, 'index.db'), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                tool TEXT NOT NULL,
+                value TEXT,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                used_at REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_used ON entries (used_at)")
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _file_path(self, key):
+        return os.path.join(self.files_dir, key[:2], key[2:])
+
+    def _lookup(self, tool, key):
+        """Возвращает строку индекса свежей записи или None (устаревшая запись удаляется)"""
+        row = self._db.execute(
+            "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[1] > self.ttl.get(tool, 0):
+            self._delete(key, row[0])
+            self._db.commit()
+            return None
+        self._db.execute("UPDATE entries SET used_at = ? WHERE key = ?", (now, key))
+        self._db.commit()
+        return row
+
+    def _delete(self, key, value):
+        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        if value is None:
+            path = self._file_path(key)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _insert(self, key, tool, value, size):
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries (key, tool, value, size, created_at, used_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, tool, value, size, now, now)
+        )
+
+    def _evict(self):
+        """Удаляет давно не использованные записи, пока кеш больше допустимого размера"""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_size:
+            return
+        for key, value, size in self._db.execute(
+            "SELECT key, value, size FROM entries ORDER BY used_at"
+        ).fetchall():
+            self._delete(key, value)
+            total -= size
+            if total <= self.max_size:
+                break
+
+    def get_file(self, tool, key, target_path):
+        """Копирует закешированный результат в target_path. Возвращает True при попадании"""
+        with self._lock:
+            if self._lookup(tool, key) is None:
+                return False
+            shutil.copyfile(self._file_path(key), target_path)
+        return True
+
+    def put_file(self, tool, key, source_path):
+        """Сохраняет файл с результатом инструмента"""
+        path = self._file_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            shutil.copyfile(source_path, path)
+            self._insert(key, tool, None, os.path.getsize(path))
+            self._evict()
+            self._db.commit()
+
+    def get_lines(self, tool, key):
+        """Список закешированных строк или None при промахе"""
+        with self._lock:
+            row = self._lookup(tool, key)
+        if row is None:
+            return None
+        return row[0].splitlines() if row[0] else []
+
+    def put_lines_many(self, tool, items):
+        """Сохраняет несколько коротких результатов: items - словарь {ключ: список строк}"""
+        with self._lock:
+            for key, lines in items.items():
+                value = "\n".join(lines)
+                self._insert(key, tool, value, len(value))
+            self._evict()
+            self._db.commit()
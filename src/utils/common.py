@@ -7,7 +7,6 @@ import os
 import sys
 import subprocess
 import time
-import threading
 from datetime import datetime
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
@@ -15,6 +14,8 @@ from concurrent.futures import ThreadPoolExecutor
 # Добавляем путь к корневой директории проекта
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from src.utils.process_supervisor import supervisor
+
 # Цвета для вывода
 GREEN = '\033[92m'
 RED = '\033[91m'
@@ -38,6 +39,9 @@ def print_warning(message):
     """Выводит предупреждение"""
     print(f"[!] {message}")
 
+class StageError(Exception):
+    """Ошибка выполнения этапа, после которой продолжать этап нельзя"""
+
 def run_command(command, output_file=None, cwd=None, debug_logger=None, timeout=300):
     """Выполняет команду и сохраняет результат в файл"""
     if debug_logger:
@@ -258,129 +262,75 @@ time_tracker = TimeTracker()
 def run_command_with_activity_monitor(command, output_file=None, cwd=None, debug_logger=None, timeout=300, activity_timeout=60):
     """
     Выполняет команду с мониторингом активности.
-    Если команда не генерирует результаты в течение activity_timeout секунд, она прерывается.
+    Активностью считается каждая новая строка stdout. Если команда не выводит строк
+    в течение activity_timeout секунд или превышает timeout, вся ее группа процессов завершается.
+    activity_timeout=None отключает контроль неактивности (для команд, пишущих только в файл).
     """
     if debug_logger:
         process_id = debug_logger.command_start(command, timeout)
     
-    # Переменные для отслеживания активности
-    last_activity = time.time()
-    initial_file_size = 0
-    if output_file and os.path.exists(output_file):
-        initial_file_size = os.path.getsize(output_file)
-    
-    # Используем список для хранения состояния между потоками
-    activity_state = {
-        'last_activity': last_activity,
-        'initial_file_size': initial_file_size,
-        'should_stop': False
-    }
-    
-    def check_activity():
-        """Проверяет активность процесса"""
-        while not activity_state['should_stop']:
-            time.sleep(10)  # Проверяем каждые 10 секунд
-            
-            # Проверяем размер выходного файла
-            if output_file and os.path.exists(output_file):
-                current_size = os.path.getsize(output_file)
-                if current_size > activity_state['initial_file_size']:
-                    activity_state['last_activity'] = time.time()
-                    activity_state['initial_file_size'] = current_size
-                    if debug_logger:
-                        debug_logger.debug(f"Активность обнаружена: файл {output_file} увеличился до {current_size} байт")
-            
-            # Проверяем, не прошло ли слишком много времени без активности
-            if time.time() - activity_state['last_activity'] > activity_timeout:
-                if debug_logger:
-                    debug_logger.warning(f"Команда неактивна {activity_timeout}с, прерываем: {command}")
-                activity_state['should_stop'] = True
-                return False
-    
-    # Запускаем мониторинг активности в отдельном потоке
-    activity_thread = threading.Thread(target=check_activity, daemon=True)
-    activity_thread.start()
-    
     try:
-        if output_file:
-            with open(output_file, 'w') as f:
-                result = subprocess.run(
-                    command, 
-                    shell=True, 
-                    stdout=f, 
-                    stderr=subprocess.PIPE, 
-                    text=True, 
-                    cwd=cwd,
-                    timeout=timeout
-                )
-        else:
-            result = subprocess.run(
-                command, 
-                shell=True, 
-                capture_output=True, 
-                text=True, 
-                cwd=cwd,
-                timeout=timeout
-            )
-        
-        # Останавливаем мониторинг активности
-        activity_state['should_stop'] = True
+        job = supervisor.run(
+            command,
+            output_file=output_file,
+            cwd=cwd,
+            timeout=timeout,
+            activity_timeout=activity_timeout
+        )
+    except Exception as e:
+        error_msg = f"Ошибка выполнения команды: {e}"
+        print_error(error_msg)
         
-        # Проверяем результат
-        if result.returncode == 0:
-            # Проверяем, есть ли результаты
-            has_results = False
-            if output_file and os.path.exists(output_file):
-                file_size = os.path.getsize(output_file)
-                if file_size > 0:
-                    has_results = True
-            
-            if has_results:
-                if debug_logger:
-                    output = f"Команда выполнена успешно, результаты сохранены в {output_file}"
-                    debug_logger.command_end(process_id, success=True, output=output)
-                print_success(f"Команда выполнена успешно: {command}")
-                return True
-            else:
-                if debug_logger:
-                    debug_logger.warning(f"Команда завершилась без результатов: {command}")
-                print_warning(f"Команда завершилась без результатов: {command}")
-                return False
-        else:
-            error_msg = f"Команда завершилась с ошибкой: {command}"
-            print_error(error_msg)
-            
-            if debug_logger:
-                debug_logger.command_end(process_id, success=False, error=result.stderr)
-                if result.stderr:
-                    debug_logger.error(f"STDERR: {result.stderr}")
-            
-            if result.stderr:
-                print_error(f"STDERR: {result.stderr}")
-            return False
-            
-    except subprocess.TimeoutExpired as e:
-        # Останавливаем мониторинг активности
-        activity_state['should_stop'] = True
+        if debug_logger:
+            debug_logger.command_end(process_id, success=False, error=str(e))
+            debug_logger.log_exception(e, f"при выполнении команды: {command}")
         
-        error_msg = f"Таймаут выполнения команды: {command}"
-        print_error(error_msg)
+        return False
+    
+    stderr = job.stderr.decode('utf-8', errors='replace')
+    
+    if job.reason == 'timeout':
+        print_error(f"Таймаут выполнения команды: {command}")
         
         if debug_logger:
             debug_logger.command_end(process_id, success=False, error=f"Таймаут: {timeout}с")
             debug_logger.warning(f"Команда зависла: {command}")
         
         return False
+    
+    if job.reason == 'inactive':
+        print_error(f"Команда неактивна {activity_timeout}с и была прервана: {command}")
         
-    except Exception as e:
-        # Останавливаем мониторинг активности
-        activity_state['should_stop'] = True
+        if debug_logger:
+            debug_logger.command_end(process_id, success=False, error=f"Нет вывода {activity_timeout}с")
+            debug_logger.warning(f"Команда неактивна {activity_timeout}с, прервана: {command}")
         
-        error_msg = f"Ошибка выполнения команды: {e}"
+        return False
+    
+    if job.returncode != 0:
+        error_msg = f"Команда завершилась с ошибкой: {command}"
         print_error(error_msg)
         
         if debug_logger:
-            debug_logger.command_end(process_id, success=False, error=str(e))
-            debug_logger.log_exception(e, f"при выполнении команды: {command}")
+            debug_logger.command_end(process_id, success=False, error=stderr)
+            if stderr:
+                debug_logger.error(f"STDERR: {stderr}")
         
-        return False 
\ No newline at end of file
+        if stderr:
+            print_error(f"STDERR: {stderr}")
+        return False
+    
+    # Для команд с выходным файлом успех означает наличие результатов
+    if output_file and not (os.path.exists(output_file) and os.path.getsize(output_file) > 0):
+        if debug_logger:
+            debug_logger.warning(f"Команда завершилась без результатов: {command}")
+        print_warning(f"Команда завершилась без результатов: {command}")
+        return False
+    
+    if debug_logger:
+        output = f"Команда выполнена успешно, строк вывода: {job.lines}"
+        if output_file:
+            output += f", результаты сохранены в {output_file}"
+        debug_logger.command_end(process_id, success=True, output=output)
+    print_success(f"Команда выполнена успешно: {command}")
+    return True
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Дедупликация больших потоков строк для BagBountyAuto
+"""
+
+import sys
+import zlib
+import math
+import hashlib
+from array import array
+from pathlib import Path
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from config.settings import DEDUP_BLOOM_CAPACITY, DEDUP_BLOOM_FP_RATE
+
+def partition_of(item, partitions):
+    """Номер раздела для строки (стабилен между процессами и запусками)"""
+    return zlib.crc32(item.encode('utf-8', 'surrogateescape')) % partitions
+
+def fingerprint(item):
+    """64-битный отпечаток строки (0 зарезервирован под пустую ячейку таблицы)"""
+    digest = hashlib.blake2b(item.encode('utf-8', 'surrogateescape'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+class ExactSet:
+    """Точное множество строк (без ложных совпадений, но с большим расходом памяти)"""
+
+    # Оценка памяти на одну строку URL средней длины
+    BYTES_PER_ITEM = 160
+
+    def __init__(self, capacity=None):
+        self._items = set()
+
+    def add(self, item):
+        """Добавляет строку. Возвращает True, если строка встретилась впервые"""
+        if item in self._items:
+            return False
+        self._items.add(item)
+        return True
+
+    def __len__(self):
+        return len(self._items)
+
+class FingerprintSet:
+    """
+    Множество 64-битных отпечатков строк в массиве с открытой адресацией.
+    Занимает 8 байт на ячейку при заполнении не более половины таблицы, то есть
+    16-32 байта на уникальную строку независимо от ее длины. Вероятность ложного
+    совпадения для n строк - порядка n^2 / 2^65.
+    """
+
+    # Худший случай: таблица заполнена на четверть сразу после расширения
+    BYTES_PER_ITEM = 32
+
+    def __init__(self, capacity=1024):
+        size = 1 << max(10, (max(capacity, 1) * 2 - 1).bit_length())
+        self._table = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def memory_bytes(self):
+        """Размер таблицы в байтах"""
+        return len(self._table) * self._table.itemsize
+
+    def add(self, item):
+        """Добавляет строку. Возвращает True, если строка встретилась впервые"""
+        return self.add_fingerprint(fingerprint(item))
+
+    def add_fingerprint(self, value):
+        table = self._table
+        mask = self._mask
+        index = value & mask
+        while True:
+            current = table[index]
+            if current == 0:
+                break
+            if current == value:
+                return False
+            index = (index + 1) & mask
+        table[index] = value
+        self._count += 1
+        if self._count * 2 > len(table):
+            self._grow()
+        return True
+
+    def _grow(self):
+        """Удваивает таблицу и переносит отпечатки"""
+        old = self._table
+        size = len(old) * 2
+        table = array('Q', bytes(8 * size))
+        mask = size - 1
+        for value in old:
+            if value:
+                index = value & mask
+                while table[index]:
+                    index = (index + 1) & mask
+                table[index] = value
+        self._table = table
+        self._mask = mask
+
+class BloomFilter:
+    """
+    Фильтр Блума: фиксированный объем памяти, рассчитанный по ожидаемому числу строк и
+    допустимой доле ложных срабатываний. Ложное срабатывание означает, что новая строка
+    будет сочтена повтором и пропущена.
+    """
+
+    def __init__(self, capacity=DEDUP_BLOOM_CAPACITY, fp_rate=DEDUP_BLOOM_FP_RATE):
+        capacity = max(capacity, 1)
+        self._size = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def memory_bytes(self):
+        """Размер битового массива в байтах"""
+        return len(self._bits)
+
+    def add(self, item):
+        """Добавляет строку. Возвращает True, если строки точно не было"""
+        digest = hashlib.blake2b(item.encode('utf-8', 'surrogateescape'), digest_size=16).digest()
+        # Двойное хеширование: позиции h1 + i * h2
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        bits = self._bits
+        size = self._size
+        new = False
+        for i in range(self._hashes):
+            position = (h1 + i * h2) % size
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                new = True
+        if new:
+            self._count += 1
+        return new
+
+# Режимы дедупликации для фильтрации URL
+DEDUP_MODES = ('fingerprint', 'exact', 'bloom')
+
+def make_dedup_set(mode='fingerprint', capacity=None, fp_rate=None):
+    """Создает множество для дедупликации: fingerprint, exact или bloom"""
+    if mode == 'exact':
+        return ExactSet()
+    if mode == 'bloom':
+        return BloomFilter(capacity or DEDUP_BLOOM_CAPACITY, fp_rate or DEDUP_BLOOM_FP_RATE)
+    if mode == 'fingerprint':
+        return FingerprintSet(capacity or 1024)
+    raise ValueError(f"Неизвестный режим дедупликации: {mode}")
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Асинхронный HTTP/1.1 клиент для BagBountyAuto
+Пулы keep-alive соединений по хостам, общий лимит и лимит на хост, таймауты,
+ограничение размера и потоковая передача тела ответа без внешних зависимостей.
+"""
+
+import ssl
+import time
+import asyncio
+from urllib.parse import urlsplit, urljoin
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) BagBountyAuto"
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Ответы, после которых запрос повторяется через ограничитель частоты
+THROTTLE_STATUSES = {429, 503}
+
+class HTTPError(Exception):
+    """Ошибка выполнения HTTP запроса"""
+
+class ResponseTooLarge(HTTPError):
+    """Тело ответа превышает допустимый размер"""
+
+class HTTPResponse:
+    """Результат HTTP запроса"""
+
+    def __init__(self, url):
+        self.url = url
+        self.status = None
+        self.headers = {}
+        self.length = 0
+        self.body = b''
+        self.elapsed = 0.0
+        self.error = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.status is not None
+
+class _Connection:
+    """Открытое соединение с хостом"""
+
+    def __init__(self, key, reader, writer):
+        self.key = key
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def close(self):
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+class AsyncHTTPClient:
+    """
+    HTTP клиент на asyncio с пулом соединений.
+    max_connections ограничивает число одновременных запросов в целом,
+    max_per_host - к одному хосту (host:port). Соединения переиспользуются (keep-alive).
+    rate_limiter (HostRateLimiter) задает частоту запросов к хосту; ответы 429/503
+    повторяются после паузы, которую он назначит.
+    """
+
+    def __init__(self, max_connections=50, max_per_host=6, timeout=10, verify_ssl=False,
+                 user_agent=DEFAULT_USER_AGENT, max_redirects=5, rate_limiter=None):
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.user_agent = user_agent
+        self.max_redirects = max_redirects
+        self.max_per_host = max_per_host
+        self._global = asyncio.Semaphore(max_connections)
+        self._host_limits = {}
+        self._idle = {}
+        self._ssl = ssl.create_default_context()
+        if not verify_ssl:
+            self._ssl.check_hostname = False
+            self._ssl.verify_mode = ssl.CERT_NONE
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        """Закрывает все простаивающие соединения"""
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle.clear()
+
+    def _host_limit(self, key):
+        if key not in self._host_limits:
+            self._host_limits[key] = asyncio.Semaphore(self.max_per_host)
+        return self._host_limits[key]
+
+    async def _with_timeout(self, coro):
+        return await asyncio.wait_for(coro, self.timeout)
+
+    async def _connect(self, key):
+        """Берет соединение из пула или открывает новое"""
+        idle = self._idle.get(key)
+        while idle:
+            connection = idle.pop()
+            if not connection.reader.at_eof():
+                connection.reused = True
+                return connection
+            connection.close()
+
+        scheme, host, port = key
+        reader, writer = await self._with_timeout(asyncio.open_connection(
+            host, port,
+            ssl=self._ssl if scheme == 'https' else None,
+            server_hostname=host if scheme == 'https' else None
+        ))
+        return _Connection(key, reader, writer)
+
+    def _release(self, connection, reusable):
+        if reusable:
+            self._idle.setdefault(connection.key, []).append(connection)
+        else:
+            connection.close()
+
+    async def request(self, url, method='GET', headers=None, sink=None, max_size=None, capture=0):
+        """
+        Выполняет запрос со следованием редиректам.
+        sink(chunk) получает тело ответа по частям (например, для записи на диск),
+        capture - сколько первых байт тела сохранить в response.body,
+        max_size - предельный размер тела, при превышении запрос прерывается с ResponseTooLarge.
+        Ошибки сети не выбрасываются, а сохраняются в response.error.
+        """
+        start = time.monotonic()
+        response = HTTPResponse(url)
+        try:
+            for _ in range(self.max_redirects + 1):
+                response = await self._limited_request(url, method, headers, sink, max_size, capture)
+                location = response.headers.get('location')
+                if response.status in REDIRECT_STATUSES and location:
+                    url = urljoin(url, location)
+                    if response.status == 303:
+                        method = 'GET'
+                    continue
+                break
+        except ResponseTooLarge as e:
+            response.error = str(e)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, HTTPError, ValueError) as e:
+            response.error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        response.elapsed = time.monotonic() - start
+        return response
+
+    async def _limited_request(self, url, method, headers, sink, max_size, capture):
+        """Запрос с учетом ограничителя частоты хоста"""
+        if self.rate_limiter is None:
+            return await self._request_once(url, method, headers, sink, max_size, capture)
+        host = (urlsplit(url).hostname or '').lower()
+        # Тело, уже переданное в sink, повторно не запрашивается
+        attempts = 1 if sink else self.rate_limiter.retries + 1
+        for _ in range(attempts):
+            await self.rate_limiter.wait_async(host)
+            response = await self._request_once(url, method, headers, sink, max_size, capture)
+            self.rate_limiter.feedback(host, response.status, response.headers.get('retry-after'))
+            if response.status not in THROTTLE_STATUSES:
+                break
+        return response
+
+    async def _request_once(self, url, method, headers, sink, max_size, capture):
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ('http', 'https') or not parts.hostname:
+            raise HTTPError(f"Неподдерживаемый URL: {url}")
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+        target = parts.path or '/'
+        if parts.query:
+            target += f"?{parts.query}"
+        host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+
+        lines = [
+            f"{method} {target} HTTP/1.1",
+            f"Host: {host_header}",
+            f"User-Agent: {self.user_agent}",
+            "Accept: */*",
+            "Accept-Encoding: identity",
+            "Connection: keep-alive"
+        ]
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        raw_request = ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1', errors='replace')
+
+        async with self._global, self._host_limit(key):
+            # Соединение из пула могло быть закрыто сервером - в этом случае повторяем на новом
+            for attempt in range(2):
+                connection = await self._connect(key)
+                try:
+                    response = HTTPResponse(url)
+                    connection.writer.write(raw_request)
+                    await self._with_timeout(connection.writer.drain())
+                    reusable = await self._read_response(
+                        connection, response, method, sink, max_size, capture
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    connection.close()
+                    if connection.reused and attempt == 0 and response.status is None:
+                        continue
+                    raise
+                except BaseException:
+                    connection.close()
+                    raise
+                self._release(connection, reusable)
+                return response
+
+    async def _read_response(self, connection, response, method, sink, max_size, capture):
+        """Читает ответ. Возвращает True, если соединение можно переиспользовать"""
+        reader = connection.reader
+
+        status_line = await self._with_timeout(reader.readline())
+        if not status_line:
+            raise asyncio.IncompleteReadError(b'', None)
+        parts = status_line.decode('latin-1').split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+            raise HTTPError(f"Некорректный ответ: {status_line[:100]!r}")
+        response.status = int(parts[1])
+
+        while True:
+            line = await self._with_timeout(reader.readline())
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response.headers[name.strip().lower()] = value.strip()
+
+        keep_alive = response.headers.get('connection', '').lower() != 'close' and parts[0] != 'HTTP/1.0'
+
+        if method == 'HEAD' or response.status in (204, 304) or 100 <= response.status < 200:
+            return keep_alive
+
+        # Тело редиректа не передается потребителю, но вычитывается ради keep-alive
+        if response.status in REDIRECT_STATUSES and 'location' in response.headers:
+            sink = None
+            capture = 0
+
+        captured = bytearray()
+
+        def consume(chunk):
+            response.length += len(chunk)
+            if max_size is not None and response.length > max_size:
+                raise ResponseTooLarge(f"Ответ больше {max_size} байт")
+            if capture and len(captured) < capture:
+                captured.extend(chunk[:capture - len(captured)])
+            if sink:
+                sink(chunk)
+
+        content_length = response.headers.get('content-length')
+        if max_size is not None and content_length and content_length.isdigit() and int(content_length) > max_size:
+            raise ResponseTooLarge(f"Ответ больше {max_size} байт ({content_length})")
+
+        try:
+            if 'chunked' in response.headers.get('transfer-encoding', '').lower():
+                while True:
+                    size_line = await self._with_timeout(reader.readline())
+                    size = int(size_line.split(b';')[0].strip() or b'0', 16)
+                    if size == 0:
+                        # Пропускаем завершающие заголовки
+                        while (await self._with_timeout(reader.readline())) not in (b'\r\n', b'\n', b''):
+                            pass
+                        break
+                    consume(await self._with_timeout(reader.readexactly(size)))
+                    await self._with_timeout(reader.readexactly(2))
+            elif content_length is not None and content_length.isdigit():
+                remaining = int(content_length)
+                while remaining:
+                    chunk = await self._with_timeout(reader.read(min(remaining, 65536)))
+                    if not chunk:
+                        raise asyncio.IncompleteReadError(b'', remaining)
+                    remaining -= len(chunk)
+                    consume(chunk)
+            else:
+                # Тело до закрытия соединения
+                keep_alive = False
+                while True:
+                    chunk = await self._with_timeout(reader.read(65536))
+                    if not chunk:
+                        break
+                    consume(chunk)
+        finally:
+            response.body = bytes(captured)
+
+        return keep_alive
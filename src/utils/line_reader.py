@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Построчное чтение больших файлов в байтах для BagBountyAuto
+Обычные файлы читаются через mmap, .gz и .zst распаковываются потоково.
+"""
+
+import io
+import os
+import gzip
+import mmap
+import shutil
+import subprocess
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Размер буфера при потоковой распаковке
+READ_BUFFER_SIZE = 1024 * 1024
+
+def _iter_mmap(path):
+    """Строки обычного файла через mmap: без копирования в буфер чтения и без декодирования"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield from iter(mm.readline, b'')
+
+def _iter_zst(path):
+    """Строки .zst: модуль zstandard, если установлен, иначе утилита zstd"""
+    if zstandard is not None:
+        with open(path, 'rb') as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f, read_size=READ_BUFFER_SIZE)
+            yield from io.BufferedReader(reader, READ_BUFFER_SIZE)
+        return
+
+    if not shutil.which('zstd'):
+        raise RuntimeError(f"Для чтения {path} нужен модуль zstandard или утилита zstd")
+    proc = subprocess.Popen(['zstd', '-dcq', path], stdout=subprocess.PIPE, bufsize=READ_BUFFER_SIZE)
+    try:
+        yield from proc.stdout
+    finally:
+        proc.stdout.close()
+        if proc.wait() != 0:
+            raise RuntimeError(f"zstd завершился с кодом {proc.returncode} при чтении {path}")
+
+def iter_lines(path):
+    """
+    Выдает строки файла как bytes (с символом конца строки).
+    Формат определяется по расширению: .gz, .zst или обычный текст.
+    """
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rb') as f:
+            yield from f
+    elif path.endswith('.zst'):
+        yield from _iter_zst(path)
+    else:
+        yield from _iter_mmap(path)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Супервизор внешних процессов для BagBountyAuto
+Один поток на селекторе обслуживает все запущенные команды: читает их вывод без блокировок,
+отслеживает активность по строкам вывода и завершает группу процессов по таймауту или неактивности.
+"""
+
+import os
+import time
+import signal
+import selectors
+import threading
+import subprocess
+
+# Сколько ждать после SIGTERM перед SIGKILL
+KILL_GRACE_PERIOD = 5
+# Сколько байт stderr хранить для отчета об ошибке
+STDERR_TAIL_SIZE = 64 * 1024
+
+def terminate_process_group(proc, sig=signal.SIGTERM):
+    """Отправляет сигнал всей группе процесса, если он еще работает"""
+    if proc.poll() is None:
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            pass
+
+class SupervisedJob:
+    """Состояние одной команды под наблюдением супервизора"""
+
+    def __init__(self, command, proc, output, timeout, activity_timeout, sink=None):
+        now = time.time()
+        self.command = command
+        self.proc = proc
+        self.output = output
+        self.sink = sink
+        self.deadline = now + timeout if timeout else None
+        self.activity_timeout = activity_timeout
+        self.last_activity = now
+        self.lines = 0
+        self.stderr = bytearray()
+        self.open_streams = 2
+        self.reason = None
+        self.kill_at = None
+        self.returncode = None
+        self.done = threading.Event()
+
+    def next_wakeup(self):
+        """Ближайший момент, когда супервизору нужно проверить команду"""
+        moments = []
+        if self.open_streams == 0:
+            # Потоки закрыты, ждем завершения процесса (в том числе после SIGTERM:
+            # потоки закрываются раньше, чем процесс можно получить через poll)
+            moments.append(time.time() + 0.1)
+        if self.kill_at:
+            moments.append(self.kill_at)
+        elif self.open_streams:
+            if self.deadline:
+                moments.append(self.deadline)
+            if self.activity_timeout:
+                moments.append(self.last_activity + self.activity_timeout)
+        return min(moments) if moments else None
+
+class ProcessSupervisor:
+    """Цикл событий на selectors, обслуживающий все дочерние процессы"""
+
+    def __init__(self):
+        self._selector = None
+        self._jobs = set()
+        self._pending = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._wakeup_r = None
+        self._wakeup_w = None
+
+    def _ensure_started(self):
+        """Запускает поток супервизора при первой команде"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._selector = selectors.DefaultSelector()
+            self._wakeup_r, self._wakeup_w = os.pipe()
+            os.set_blocking(self._wakeup_r, False)
+            self._selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+            self._thread = threading.Thread(target=self._loop, name="process-supervisor", daemon=True)
+            self._thread.start()
+
+    def run(self, command, output_file=None, cwd=None, timeout=300, activity_timeout=60, sink=None):
+        """
+        Запускает команду и блокирует вызывающий поток до ее завершения.
+        command - строка для shell или список аргументов (запускается без shell).
+        sink(data) получает stdout по частям в потоке супервизора и должен возвращаться быстро.
+        Возвращает SupervisedJob с кодом возврата, причиной остановки и хвостом stderr.
+        """
+        self._ensure_started()
+
+        output = open(output_file, 'wb') if output_file else None
+        try:
+            proc = subprocess.Popen(
+                command,
+                shell=isinstance(command, str),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=cwd,
+                start_new_session=True
+            )
+        except Exception:
+            if output:
+                output.close()
+            raise
+
+        job = SupervisedJob(command, proc, output, timeout, activity_timeout, sink)
+        with self._lock:
+            self._pending.append(job)
+        os.write(self._wakeup_w, b'\0')
+
+        job.done.wait()
+        return job
+
+    def _register(self, job):
+        self._jobs.add(job)
+        for stream in (job.proc.stdout, job.proc.stderr):
+            os.set_blocking(stream.fileno(), False)
+            self._selector.register(stream, selectors.EVENT_READ, job)
+
+    def _loop(self):
+        while True:
+            try:
+                self._step()
+            except Exception:
+                # Ошибка вне обработки отдельной команды (например, в селекторе) не должна
+                # останавливать поток: иначе вызывающие навсегда остаются в job.done.wait().
+                # Все текущие команды завершаются с причиной 'error', цикл продолжается
+                with self._lock:
+                    pending, self._pending = self._pending, []
+                for job in list(self._jobs) + pending:
+                    self._fail(job)
+                time.sleep(0.1)
+
+    def _step(self):
+        """Одна итерация цикла: ожидание событий, чтение вывода, проверка сроков"""
+        wakeups = [m for m in (job.next_wakeup() for job in self._jobs) if m is not None]
+        select_timeout = max(0, min(wakeups) - time.time()) if wakeups else None
+
+        for key, _ in self._selector.select(select_timeout):
+            if key.data is None:
+                os.read(self._wakeup_r, 4096)
+                with self._lock:
+                    pending, self._pending = self._pending, []
+                for job in pending:
+                    try:
+                        self._register(job)
+                    except Exception:
+                        self._fail(job)
+                continue
+            job = key.data
+            try:
+                self._read(key.fileobj, job)
+            except Exception:
+                # Ошибка записи вывода не должна останавливать остальные команды
+                job.reason = 'error'
+                terminate_process_group(job.proc, signal.SIGKILL)
+                self._close_streams(job)
+
+        self._check_jobs()
+
+    def _fail(self, job):
+        """Завершает команду с причиной 'error' и освобождает ожидающего ее вызывающего"""
+        if job.done.is_set():
+            return
+        job.reason = 'error'
+        try:
+            terminate_process_group(job.proc, signal.SIGKILL)
+            job.proc.wait(timeout=KILL_GRACE_PERIOD)
+        except Exception:
+            pass
+        try:
+            self._close_streams(job)
+        except Exception:
+            pass
+        self._finish(job)
+
+    def _read(self, stream, job):
+        """Читает доступные данные из stdout или stderr команды"""
+        try:
+            data = os.read(stream.fileno(), 65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+
+        if not data:
+            self._selector.unregister(stream)
+            stream.close()
+            job.open_streams -= 1
+            return
+
+        if stream is job.proc.stdout:
+            if job.output:
+                job.output.write(data)
+            if job.sink:
+                job.sink(data)
+            # Активность считается по завершенным строкам вывода
+            new_lines = data.count(b'\n')
+            if new_lines:
+                job.lines += new_lines
+                job.last_activity = time.time()
+        else:
+            job.stderr += data
+            if len(job.stderr) > STDERR_TAIL_SIZE:
+                del job.stderr[:-STDERR_TAIL_SIZE]
+
+    def _check_jobs(self):
+        """Завершает просроченные команды и освобождает завершившиеся"""
+        now = time.time()
+        for job in list(self._jobs):
+            try:
+                self._check_job(job, now)
+            except Exception:
+                self._fail(job)
+
+    def _check_job(self, job, now):
+        """Проверяет одну команду: освобождает завершившуюся, завершает просроченную"""
+        if job.open_streams == 0 and job.proc.poll() is not None:
+            self._finish(job)
+            return
+
+        if job.kill_at:
+            if job.proc.poll() is not None:
+                # Процесс завершен, но его потоки держит кто-то вне группы
+                self._close_streams(job)
+                self._finish(job)
+            elif now >= job.kill_at:
+                terminate_process_group(job.proc, signal.SIGKILL)
+                job.kill_at = now + KILL_GRACE_PERIOD
+            return
+
+        if job.deadline and now >= job.deadline:
+            job.reason = 'timeout'
+        elif job.activity_timeout and now - job.last_activity >= job.activity_timeout:
+            job.reason = 'inactive'
+
+        if job.reason:
+            terminate_process_group(job.proc)
+            job.kill_at = now + KILL_GRACE_PERIOD
+
+    def _close_streams(self, job):
+        for stream in (job.proc.stdout, job.proc.stderr):
+            if not stream.closed:
+                try:
+                    self._selector.unregister(stream)
+                except (KeyError, ValueError):
+                    # Поток не был зарегистрирован (ошибка при регистрации команды)
+                    pass
+                stream.close()
+        job.open_streams = 0
+
+    def _finish(self, job):
+        self._jobs.discard(job)
+        job.returncode = job.proc.returncode
+        try:
+            if job.output:
+                job.output.close()
+        finally:
+            job.done.set()
+
+# Глобальный экземпляр супервизора
+supervisor = ProcessSupervisor()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Ограничение частоты запросов по хостам для BagBountyAuto
+Token bucket на каждый хост со скоростью, которая подстраивается под ответы сервера:
+на 429/503 скорость снижается, а хост блокируется на Retry-After; успешные
+ответы постепенно возвращают скорость к максимуму. Один ограничитель разделяется
+между sqlmap, nuclei и ручным тестированием payloads. Ответы сервера в feedback()
+передает только ручное тестирование: sqlmap и nuclei получают скорость хостов на
+момент запуска (--delay, -rate-limit), и их 429/503 ограничитель не видит.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from config.settings import RATE_LIMIT_CONFIG
+from src.utils.http_client import THROTTLE_STATUSES
+
+def url_host(url):
+    """Хост URL в нижнем регистре (ключ ограничителя)"""
+    try:
+        return (urlsplit(url).hostname or '').lower()
+    except ValueError:
+        return ''
+
+def parse_retry_after(value):
+    """Заголовок Retry-After в секундах (число или HTTP-дата); None, если не разобран"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+class _Bucket:
+    """Состояние одного хоста"""
+
+    __slots__ = ('rate', 'tokens', 'updated', 'blocked_until', 'generation')
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        # Меняется на каждый ответ 429/503: резервирования до него недействительны
+        self.generation = 0
+
+class HostRateLimiter:
+    """
+    Token bucket по хостам. wait()/wait_async() резервируют токен и ждут своей очереди,
+    feedback() подстраивает скорость хоста по статусу ответа. Ответ 429/503, пришедший во
+    время ожидания, отменяет резервирования: ожидающие резервируют токен заново с новой
+    скоростью и после окончания блокировки.
+    Потокобезопасен: используется и из потоков внешних инструментов, и из asyncio.
+    """
+
+    def __init__(self, config=None):
+        self.config = {**RATE_LIMIT_CONFIG, **(config or {})}
+        self.retries = self.config['retries']
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(self.config['rate'], self.config['burst'])
+        return bucket
+
+    def _reserve(self, host):
+        """Забирает токен хоста. Возвращает (сколько секунд ждать до запроса, поколение хоста)"""
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+            # Во время блокировки токены не накапливаются: отсчет идет от ее окончания
+            start = max(now, bucket.blocked_until)
+            if start > bucket.updated:
+                bucket.tokens = min(self.config['burst'], bucket.tokens + (start - bucket.updated) * bucket.rate)
+                bucket.updated = start
+            # Токены уходят в минус: следующие запросы встают в очередь за уже ожидающими
+            bucket.tokens -= 1
+            wait = -bucket.tokens / bucket.rate if bucket.tokens < 0 else 0.0
+            return start - now + wait, bucket.generation
+
+    def _still_valid(self, host, generation):
+        """Можно ли отправлять запрос после ожидания: не было 429/503 и хост не заблокирован"""
+        with self._lock:
+            bucket = self._bucket(host)
+            return bucket.generation == generation and time.monotonic() >= bucket.blocked_until
+
+    def wait(self, host):
+        """Блокирует поток до разрешения запроса к хосту"""
+        while True:
+            delay, generation = self._reserve(host)
+            if delay > 0:
+                time.sleep(delay)
+            if self._still_valid(host, generation):
+                return
+
+    async def wait_async(self, host):
+        """То же для asyncio"""
+        while True:
+            delay, generation = self._reserve(host)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self._still_valid(host, generation):
+                return
+
+    def feedback(self, host, status, retry_after=None):
+        """
+        Учитывает ответ хоста: 429/503 снижают скорость и блокируют хост на Retry-After
+        (или на интервал между запросами), остальные ответы постепенно ее повышают.
+        """
+        if status is None:
+            return
+        with self._lock:
+            bucket = self._bucket(host)
+            if status in THROTTLE_STATUSES:
+                now = time.monotonic()
+                # Пачка 429 на запросы, отправленные до первого из них, снижает скорость один раз
+                if now >= bucket.blocked_until:
+                    bucket.rate = max(self.config['min_rate'], bucket.rate * self.config['backoff'])
+                pause = parse_retry_after(retry_after)
+                if pause is None:
+                    pause = 1 / bucket.rate
+                pause = min(pause, self.config['max_retry_after'])
+                bucket.blocked_until = max(bucket.blocked_until, now + pause)
+                # Очередь ожидающих сбрасывается: они резервируют токены заново, и после
+                # блокировки первый запрос уходит сразу, остальные - с новой скоростью
+                bucket.tokens = 1
+                bucket.updated = bucket.blocked_until
+                bucket.generation += 1
+            elif status < 500:
+                bucket.rate = min(self.config['max_rate'], bucket.rate + self.config['increase'])
+
+    def rate(self, host):
+        """Текущая разрешенная скорость хоста (запросов в секунду)"""
+        with self._lock:
+            return self._bucket(host).rate
+
+    def delay(self, host):
+        """Интервал между запросами к хосту в секундах (для --delay внешних инструментов)"""
+        return 1 / self.rate(host)
+
+    def spread_rate(self, hosts):
+        """
+        Общий лимит для инструмента, который распределяет запросы по целям поровну
+        (hosts - хост каждой цели, с повторами): хост с долей целей n/total получает
+        ту же долю запросов, поэтому лимит - наименьшее rate(host) * total / n.
+        Для целей по одной на хост это min(скоростей) * число хостов.
+        """
+        counts = Counter(hosts)
+        if not counts:
+            return 0.0
+        total = sum(counts.values())
+        return min(self.rate(host) * total / count for host, count in counts.items())
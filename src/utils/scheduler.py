@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Планировщик этапов BagBountyAuto на основе графа зависимостей
+Каждый этап объявляет свои входы и выходы и запускается сразу, как только готовы все входы
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from src.utils.common import print_warning, StageError
+
+class Stage:
+    """Этап конвейера с объявленными входами и выходами"""
+
+    def __init__(self, name, func, inputs=(), outputs=(), required=True):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.required = required
+
+class StageScheduler:
+    """
+    Выполняет этапы параллельно в порядке зависимостей.
+    Функция этапа получает словарь готовых артефактов и возвращает словарь своих выходов.
+    Ошибка обязательного этапа прерывает выполнение, ошибка необязательного -
+    заменяет его выходы на None, и зависимые этапы продолжают работу.
+    """
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.stages = []
+
+    def add_stage(self, name, func, inputs=(), outputs=(), required=True):
+        """Добавляет этап в граф"""
+        stage = Stage(name, func, inputs, outputs, required)
+        self.stages.append(stage)
+        return stage
+
+    def _validate(self, artifacts):
+        """Проверяет, что все входы этапов кем-то производятся"""
+        produced = set(artifacts)
+        for stage in self.stages:
+            for output in stage.outputs:
+                if output in produced:
+                    raise ValueError(f"Артефакт '{output}' производится несколькими этапами")
+                produced.add(output)
+
+        for stage in self.stages:
+            missing = [name for name in stage.inputs if name not in produced]
+            if missing:
+                raise ValueError(f"Этап '{stage.name}' зависит от неизвестных артефактов: {', '.join(missing)}")
+
+    def _run_stage(self, stage, artifacts):
+        """Вызывает функцию этапа и проверяет его выходы"""
+        inputs = {name: artifacts[name] for name in stage.inputs}
+        result = stage.func(inputs) or {}
+        return {name: result.get(name) for name in stage.outputs}
+
+    def run(self, artifacts=None):
+        """Выполняет все этапы и возвращает словарь всех артефактов"""
+        artifacts = dict(artifacts or {})
+        self._validate(artifacts)
+
+        pending = list(self.stages)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # Запускаем все этапы, входы которых уже готовы
+                for stage in [s for s in pending if all(name in artifacts for name in s.inputs)]:
+                    pending.remove(stage)
+                    running[executor.submit(self._run_stage, stage, artifacts)] = stage
+
+                if not running:
+                    names = ', '.join(stage.name for stage in pending)
+                    raise ValueError(f"Циклическая зависимость между этапами: {names}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        artifacts.update(future.result())
+                    except Exception as e:
+                        if stage.required:
+                            # Не запускаем новые этапы и дожидаемся уже запущенных
+                            wait(running)
+                            if isinstance(e, StageError):
+                                raise
+                            raise StageError(f"Этап '{stage.name}' завершился с ошибкой: {e}") from e
+
+                        print_warning(f"Этап '{stage.name}' завершился с ошибкой: {e}")
+                        artifacts.update({name: None for name in stage.outputs})
+
+        return artifacts
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Хранилище URL запуска для BagBountyAuto
+Один файл SQLite (<recon_dir>/urls/urls.db) со столбцами, которые разбираются один раз
+при добавлении URL: хост, путь, расширение, имена параметров и источники. Фильтрация и анализ
+по-прежнему читают текстовые файлы (потоково и параллельно) и только добавляют в
+хранилище свои метки (категория, прошел фильтр, тип уязвимости); запросами по столбцам и меткам URL
+выбирает сканер.
+"""
+
+import os
+import sys
+import sqlite3
+import threading
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from config.settings import URL_STORE_FILE, URL_STORE_CACHE_MB
+
+# Количество строк в одной пакетной вставке
+BATCH_SIZE = 10_000
+
+# Метка URL, прошедших фильтрацию
+FILTERED_TAG = 'filtered'
+# Метка URL, не встречавшихся в прошлых запусках (инкрементальный режим)
+NEW_TAG = 'new'
+
+# Отметки в таблице meta: фильтрация выполнена (даже если не оставила ни одного URL)
+# и запуск инкрементальный (дальше по конвейеру переданы только URL с меткой NEW_TAG)
+FILTER_DONE = 'filter_done'
+INCREMENTAL = 'incremental'
+
+def store_path(recon_dir):
+    """Путь к хранилищу URL директории разведки"""
+    return os.path.join(recon_dir, 'urls', URL_STORE_FILE)
+
+def _key(url):
+    """
+    Значение столбца url: строки с произвольными байтами (суррогаты после чтения с
+    surrogateescape) не кодируются в UTF-8 и хранятся как BLOB без потерь
+    """
+    if url.isascii():
+        return url
+    try:
+        url.encode('utf-8')
+        return url
+    except UnicodeEncodeError:
+        return url.encode('utf-8', 'surrogateescape')
+
+def _url(value):
+    """Обратное преобразование значения столбца url"""
+    return value.decode('utf-8', 'surrogateescape') if isinstance(value, bytes) else value
+
+def parse_url(url):
+    """
+    Столбцы URL: хост, путь, расширение и список имен параметров без повторов.
+    Разбор вручную вместо urlsplit - он занимает большую часть времени загрузки.
+    """
+    rest = url.split('#', 1)[0]
+    scheme_end = rest.find('://')
+    if scheme_end != -1:
+        rest = rest[scheme_end + 3:]
+    rest, _, query = rest.partition('?')
+    slash = rest.find('/')
+    if slash == -1:
+        netloc, path = rest, ''
+    else:
+        netloc, path = rest[:slash], rest[slash:]
+    host = netloc.rpartition('@')[2]
+    if host.startswith('['):
+        host = host[1:].partition(']')[0]
+    else:
+        host = host.partition(':')[0]
+    last = path.rpartition('/')[2]
+    ext = last.rpartition('.')[2].lower() if '.' in last else ''
+    names = []
+    if query:
+        for pair in query.split('&'):
+            name = pair.partition('=')[0]
+            if name and name not in names:
+                names.append(name)
+    return host.lower(), path, ext, names
+
+class UrlStore:
+    """
+    Таблица urls (по строке на уникальный URL), params (имя параметра -> URL) и
+    tags (метка -> URL). Источники одного URL накапливаются через запятую.
+    reset=True удаляет хранилище прошлого запуска в той же директории.
+    """
+
+    def __init__(self, path, reset=False):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if reset:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        # Индексы по URL вставляются в случайном порядке: без большого кеша страниц
+        # загрузка упирается в чтение страниц индекса с диска
+        self._db.execute(f"PRAGMA cache_size=-{URL_STORE_CACHE_MB * 1024}")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS urls (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL UNIQUE,
+                host TEXT NOT NULL,
+                path TEXT NOT NULL,
+                ext TEXT NOT NULL,
+                params TEXT NOT NULL,
+                sources TEXT NOT NULL
+            );
+            -- Выборка URL хоста (query(host=...)) без полного просмотра таблицы
+            CREATE INDEX IF NOT EXISTS urls_host ON urls (host);
+            CREATE TABLE IF NOT EXISTS params (
+                name TEXT NOT NULL,
+                url_id INTEGER NOT NULL,
+                PRIMARY KEY (name, url_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS tags (
+                tag TEXT NOT NULL,
+                url_id INTEGER NOT NULL,
+                PRIMARY KEY (tag, url_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _insert_batch(self, batch, source):
+        """
+        Добавляет пакет URL: новые разбираются, у известных дополняется список источников.
+        Возвращает URL пакета, которых еще не было в хранилище, в порядке первого появления.
+        """
+        rows = []
+        names_by_key = {}
+        for url in batch:
+            key = _key(url)
+            if isinstance(key, bytes):
+                # Столбцы разбора должны быть текстом: непредставимые байты заменяются
+                url = key.decode('utf-8', 'replace')
+            host, path, ext, names = parse_url(url)
+            if names:
+                names_by_key[key] = names
+            # Столбец params - для просмотра и условия "есть параметры"; имя может содержать
+            # запятую, поэтому таблица params заполняется из списка, а не из этой строки
+            rows.append((key, host, path, ext, ",".join(names), source))
+        with self._lock:
+            # Новые строки получают id больше текущего максимума: по ним выбираются
+            # добавленные URL и заполняется params
+            last_id = self._db.execute("SELECT COALESCE(MAX(id), 0) FROM urls").fetchone()[0]
+            self._db.executemany("""
+                INSERT INTO urls (url, host, path, ext, params, sources) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET sources = sources || ',' || excluded.sources
+                WHERE instr(',' || sources || ',', ',' || excluded.sources || ',') = 0
+            """, rows)
+            new_rows = self._db.execute(
+                "SELECT id, url FROM urls WHERE id > ? ORDER BY id", (last_id,)
+            ).fetchall()
+            self._db.executemany(
+                "INSERT OR IGNORE INTO params (name, url_id) VALUES (?, ?)",
+                [(name, url_id) for url_id, key in new_rows for name in names_by_key.get(key, ())]
+            )
+        return [_url(key) for _, key in new_rows]
+
+    def insert_urls(self, urls, source):
+        """
+        Добавляет URL из источника (имя инструмента) и сразу после вставки каждого пакета
+        выдает URL, которых еще не было в хранилище: уникальные URL передаются дальше
+        по конвейеру, не дожидаясь загрузки всех источников.
+        """
+        batch = []
+        for url in urls:
+            if not url:
+                continue
+            batch.append(url)
+            if len(batch) >= BATCH_SIZE:
+                yield from self._insert_batch(batch, source)
+                batch = []
+        if batch:
+            yield from self._insert_batch(batch, source)
+        with self._lock:
+            self._db.commit()
+
+    def add_urls(self, urls, source):
+        """Добавляет URL из источника без выдачи новых. Возвращает количество новых URL"""
+        return sum(1 for _ in self.insert_urls(urls, source))
+
+    def iter_urls(self):
+        """Все URL в порядке первого добавления"""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT id, url FROM urls WHERE id > ? ORDER BY id LIMIT ?", (last_id, BATCH_SIZE)
+                ).fetchall()
+            if not rows:
+                return
+            for _, url in rows:
+                yield _url(url)
+            last_id = rows[-1][0]
+
+    def add_tags(self, tag, urls):
+        """Помечает URL меткой этапа. URL, которых нет в хранилище, пропускаются"""
+        self.add_tag_pairs((tag, url) for url in urls)
+
+    def add_tag_pairs(self, pairs):
+        """То же для пар (метка, URL) с разными метками"""
+        batch = []
+        for pair in pairs:
+            batch.append((pair[0], _key(pair[1])))
+            if len(batch) >= BATCH_SIZE:
+                self._tag_batch(batch)
+                batch = []
+        if batch:
+            self._tag_batch(batch)
+        with self._lock:
+            self._db.commit()
+
+    def _tag_batch(self, batch):
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO tags (tag, url_id) SELECT ?, id FROM urls WHERE url = ?", batch
+            )
+
+    def set_meta(self, key, value='1'):
+        """Сохраняет отметку этапа (FILTER_DONE, INCREMENTAL)"""
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+            self._db.commit()
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def tagged(self, tag):
+        """Проверяет, есть ли в хранилище URL с меткой"""
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM tags WHERE tag = ? LIMIT 1", (tag,)).fetchone() is not None
+
+    def query(self, param=None, host=None, tag=None, ext=None, with_params=False, limit=None):
+        """
+        URL по условиям (все условия объединяются через AND), в порядке добавления.
+        Например, query(param='id', host='api.example.com') - URL с параметром id на хосте.
+        """
+        sql = "SELECT url FROM urls"
+        where = []
+        args = []
+        if param is not None:
+            where.append("id IN (SELECT url_id FROM params WHERE name = ?)")
+            args.append(param)
+        if tag is not None:
+            where.append("id IN (SELECT url_id FROM tags WHERE tag = ?)")
+            args.append(tag)
+        if host is not None:
+            where.append("host = ?")
+            args.append(host)
+        if ext is not None:
+            where.append("ext = ?")
+            args.append(ext.lower())
+        if with_params:
+            where.append("params != ''")
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id"
+        if limit:
+            sql += " LIMIT ?"
+            args.append(limit)
+        with self._lock:
+            return [_url(row[0]) for row in self._db.execute(sql, args)]
+
+    def count(self, tag=None):
+        """Количество URL (с меткой tag, если задана)"""
+        with self._lock:
+            if tag is None:
+                return self._db.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+            return self._db.execute("SELECT COUNT(*) FROM tags WHERE tag = ?", (tag,)).fetchone()[0]
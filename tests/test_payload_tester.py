@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Тесты ручного тестирования payloads и AsyncHTTPClient на локальном HTTP-сервере
+"""
+
+import os
+import sys
+import asyncio
+import unittest
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Модуль импортируется целиком: его функции test_payloads* pytest принял бы за тесты
+from src.scanner import payload_tester
+from src.utils.http_client import AsyncHTTPClient
+from src.utils.rate_limiter import HostRateLimiter
+
+SQL_ERROR = "You have an error in your SQL syntax near"
+BIG_SIZE = 100000
+CHUNKS = [b'first-', b'second-', b'third']
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Ответы по пути: отражение, ошибка SQL, редирект, chunked, большое тело, 429"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, body, status=200, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_chunked(self, chunks):
+        self.send_response(200)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for chunk in chunks:
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+        self.wfile.write(b'0\r\n\r\n')
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        value = next(iter(parse_qs(parts.query).values()), [''])[0]
+        if parts.path == '/search':
+            self.send_body(f"<p>Результаты: {value}</p>".encode())
+        elif parts.path == '/item':
+            self.send_body((SQL_ERROR if "'" in value else "item").encode())
+        elif parts.path == '/noisy':
+            # Ошибка SQL есть и в исходном ответе: это не признак срабатывания payload
+            self.send_body(f"{SQL_ERROR} {len(value)}".encode())
+        elif parts.path == '/go':
+            self.send_body(b'', status=302, headers={'Location': value})
+        elif parts.path == '/chunked':
+            self.send_chunked(CHUNKS)
+        elif parts.path == '/big':
+            self.send_body(b'x' * BIG_SIZE)
+        elif parts.path == '/big-chunked':
+            self.send_chunked([b'x' * 10000] * (BIG_SIZE // 10000))
+        elif parts.path == '/limited':
+            with self.server.lock:
+                self.server.limited_hits += 1
+                first = self.server.limited_hits == 1
+            if first:
+                self.send_body(b'slow down', status=429, headers={'Retry-After': '0'})
+            else:
+                self.send_body(b'ok')
+        else:
+            self.send_body(b'not found', status=404)
+
+class StubServerTest(unittest.TestCase):
+    """Сервер на свободном порту в отдельном потоке, новый для каждого теста"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.connections = 0
+        self.server.limited_hits = 0
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fetch(self, paths, **kwargs):
+        """Последовательные запросы одним клиентом; список ответов"""
+        async def run():
+            async with AsyncHTTPClient(max_per_host=1, timeout=5) as client:
+                return [await client.request(self.base + path, **kwargs) for path in paths]
+        return asyncio.run(run())
+
+class PayloadCasesTest(unittest.TestCase):
+
+    def test_one_case_per_parameter_type_and_payload(self):
+        payloads = {'xss': ['<x>', 'unused'], 'sqli': ["'"]}
+        cases = list(payload_tester.payload_cases('http://h/p?a=1&flag&c=2', payloads, per_type=1))
+        self.assertEqual(cases, [
+            ('a', 'xss', '<x>', 'http://h/p?a=%3Cx%3E&flag&c=2'),
+            ('a', 'sqli', "'", 'http://h/p?a=%27&flag&c=2'),
+            ('c', 'xss', '<x>', 'http://h/p?a=1&flag&c=%3Cx%3E'),
+            ('c', 'sqli', "'", 'http://h/p?a=1&flag&c=%27'),
+        ])
+
+    def test_no_cases_without_query(self):
+        self.assertEqual(list(payload_tester.payload_cases('http://h/p', {'xss': ['<x>']})), [])
+
+class EvaluateTest(StubServerTest):
+
+    def run_payloads(self, paths, payloads):
+        results = payload_tester.test_payloads(
+            [self.base + path for path in paths], payloads,
+            rate_limiter=HostRateLimiter({'rate': 1000, 'burst': 1000})
+        )
+        return {(result['vuln_type'], urlsplit(result['url']).path): result for result in results}
+
+    def test_findings(self):
+        results = self.run_payloads(
+            ['/search?q=1', '/item?id=1', '/noisy?id=1', '/go?next=/home'],
+            {'xss': ['<svg onload=1>'], 'sqli': ["' OR 1=1--"], 'open_redirect': ['https://evil.com']}
+        )
+        self.assertEqual(len(results), 12)
+        self.assertEqual(results[('xss', '/search')]['findings'], ['reflected'])
+        self.assertEqual(results[('sqli', '/item')]['findings'], ['signature: SQL syntax'])
+        self.assertEqual(results[('sqli', '/item')]['baseline_status'], 200)
+        # Сигнатура есть и в исходном ответе
+        self.assertEqual(results[('sqli', '/noisy')]['findings'], [])
+        # Редиректы не выполняются: Location проверяется в ответе 302
+        redirect = results[('open_redirect', '/go')]
+        self.assertEqual(redirect['status_code'], '302')
+        self.assertEqual(redirect['findings'], ['redirect: https://evil.com'])
+        self.assertEqual(results[('open_redirect', '/item')]['findings'], [])
+
+class AsyncHTTPClientTest(StubServerTest):
+
+    def test_keep_alive_reuses_connection(self):
+        responses = self.fetch(['/item?id=1'] * 5, capture=100)
+        self.assertTrue(all(response.ok and response.body == b'item' for response in responses))
+        self.assertEqual(self.server.connections, 1)
+
+    def test_chunked_body(self):
+        chunks = []
+        responses = self.fetch(['/chunked', '/chunked'], sink=chunks.append, capture=100)
+        for response in responses:
+            self.assertTrue(response.ok)
+            self.assertEqual(response.body, b''.join(CHUNKS))
+            self.assertEqual(response.length, len(b''.join(CHUNKS)))
+        self.assertEqual(b''.join(chunks), b''.join(CHUNKS) * 2)
+        # Chunked-тело вычитывается до конца, и соединение переиспользуется
+        self.assertEqual(self.server.connections, 1)
+
+    def test_capture_limits_body(self):
+        response, = self.fetch(['/big'], capture=10)
+        self.assertTrue(response.ok)
+        self.assertEqual(response.body, b'x' * 10)
+        self.assertEqual(response.length, BIG_SIZE)
+
+    def test_max_size(self):
+        # По Content-Length - до чтения тела, без него - по мере чтения chunked-тела
+        limit = BIG_SIZE // 2
+        for path, received_before_error in (('/big', False), ('/big-chunked', True)):
+            chunks = []
+            response, = self.fetch([path], sink=chunks.append, max_size=limit)
+            self.assertFalse(response.ok)
+            self.assertIn(str(limit), response.error)
+            received = sum(map(len, chunks))
+            self.assertLessEqual(received, limit)
+            self.assertEqual(received > 0, received_before_error)
+        self.assertEqual(self.fetch(['/big'], max_size=BIG_SIZE)[0].length, BIG_SIZE)
+
+    def test_throttled_request_is_retried(self):
+        async def run():
+            limiter = HostRateLimiter({'rate': 1000, 'burst': 1000})
+            async with AsyncHTTPClient(timeout=5, rate_limiter=limiter) as client:
+                return await client.request(self.base + '/limited', capture=100), limiter
+        response, limiter = asyncio.run(run())
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.body, b'ok')
+        self.assertEqual(self.server.limited_hits, 2)
+        self.assertLess(limiter.rate('127.0.0.1'), 1000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Тесты очереди сканирования ScanQueue
+"""
+
+import os
+import sys
+import random
+import unittest
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.scanner.prioritizer import ScanQueue
+from src.filter.filter_recon import url_shape
+
+class ScanQueueTest(unittest.TestCase):
+
+    def test_order_by_score(self):
+        queue = ScanQueue(shape_penalty=3)
+        queue.push('http://a.com/x?q=1', 1)
+        queue.push('http://b.com/y?id=1', 5)
+        queue.push('http://c.com/z?url=1', 3)
+        self.assertEqual([url for url, _, _ in queue.take()],
+                         ['http://b.com/y?id=1', 'http://c.com/z?url=1', 'http://a.com/x?q=1'])
+        self.assertEqual(len(queue), 0)
+
+    def test_shape_repeat_penalty_when_better_url_pushed_later(self):
+        # URL формы с меньшей оценкой добавлен раньше: его исходная запись в общей куче
+        # не должна обходить понижение после выбора лучшего URL той же формы
+        queue = ScanQueue(shape_penalty=3)
+        queue.push('http://a.com/p?id=1', 9)
+        queue.push('http://a.com/p?id=2', 10)
+        queue.push('http://b.com/x?q=1', 8)
+        self.assertEqual(queue.take(), [
+            ('http://a.com/p?id=2', 10, []),
+            ('http://b.com/x?q=1', 8, []),
+            ('http://a.com/p?id=1', 6, ['shape_repeat:1']),
+        ])
+
+    def test_matches_naive_selection(self):
+        random.seed(0)
+        for _ in range(100):
+            items = [(f"http://h{random.randrange(3)}.com/p?id={i}", random.randrange(20)) for i in range(30)]
+            queue = ScanQueue(shape_penalty=3)
+            for url, score in items:
+                queue.push(url, score)
+            scores = [score for _, score, _ in queue.take()]
+
+            # Эталон: каждый раз выбирается URL с наибольшей оценкой с учетом понижения
+            rest = list(items)
+            taken = {}
+            expected = []
+            while rest:
+                best = max(rest, key=lambda item: item[1] - 3 * taken.get(url_shape(item[0]), 0))
+                shape = url_shape(best[0])
+                expected.append(best[1] - 3 * taken.get(shape, 0))
+                taken[shape] = taken.get(shape, 0) + 1
+                rest.remove(best)
+            self.assertEqual(scores, expected)
+
+    def test_take_limit(self):
+        queue = ScanQueue()
+        for i in range(5):
+            queue.push(f"http://h{i}.com/?a=1", i)
+        self.assertEqual(len(queue.take(2)), 2)
+        self.assertEqual(len(queue), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Тесты супервизора внешних процессов ProcessSupervisor
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.utils.process_supervisor import ProcessSupervisor
+
+# Сколько ждать завершения run(): дольше - значит, вызывающий поток завис
+RUN_TIMEOUT = 10
+
+def fail_once(original):
+    """Обертка метода, которая выбрасывает исключение при первом вызове"""
+    calls = []
+
+    def wrapper(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("сбой супервизора")
+        return original(*args, **kwargs)
+    return wrapper
+
+class ProcessSupervisorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.supervisor = ProcessSupervisor()
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def run_command(self, command, **kwargs):
+        """supervisor.run в отдельном потоке; None, если он не вернулся за RUN_TIMEOUT"""
+        result = []
+        thread = threading.Thread(target=lambda: result.append(self.supervisor.run(command, **kwargs)), daemon=True)
+        thread.start()
+        thread.join(RUN_TIMEOUT)
+        return result[0] if result else None
+
+    def assert_recovers(self):
+        """После сбоя супервизор продолжает обслуживать новые команды"""
+        job = self.run_command('echo ok')
+        self.assertIsNotNone(job)
+        self.assertEqual(job.returncode, 0)
+        self.assertIsNone(job.reason)
+
+    def test_output_and_sink(self):
+        output = os.path.join(self.dir, 'out.txt')
+        chunks = []
+        job = self.run_command(['sh', '-c', 'echo one; echo two >&2; exit 3'], output_file=output, sink=chunks.append)
+        self.assertEqual(job.returncode, 3)
+        self.assertEqual(job.lines, 1)
+        self.assertEqual(bytes(job.stderr), b'two\n')
+        self.assertEqual(b''.join(chunks), b'one\n')
+        with open(output, 'rb') as f:
+            self.assertEqual(f.read(), b'one\n')
+
+    def test_timeout(self):
+        # Потоки закрываются раньше, чем процесс можно получить через poll: супервизор не
+        # должен ждать до SIGKILL (KILL_GRACE_PERIOD), повторы ловят это окно
+        for _ in range(20):
+            start = time.time()
+            job = self.run_command(['sh', '-c', 'exec sleep 30'], timeout=0.05, activity_timeout=None)
+            self.assertEqual(job.reason, 'timeout')
+            self.assertLess(time.time() - start, 1)
+
+    def test_job_check_error_fails_only_that_job(self):
+        with mock.patch.object(self.supervisor, '_check_job', fail_once(self.supervisor._check_job)):
+            job = self.run_command('sleep 30', timeout=None, activity_timeout=None)
+        self.assertIsNotNone(job, "run() завис после ошибки проверки команды")
+        self.assertEqual(job.reason, 'error')
+        self.assert_recovers()
+
+    def test_register_error(self):
+        with mock.patch.object(self.supervisor, '_register', fail_once(self.supervisor._register)):
+            job = self.run_command('sleep 30', timeout=None, activity_timeout=None)
+        self.assertIsNotNone(job, "run() завис после ошибки регистрации команды")
+        self.assertEqual(job.reason, 'error')
+        self.assert_recovers()
+
+    def test_loop_error_fails_jobs_and_keeps_running(self):
+        with mock.patch.object(self.supervisor, '_check_jobs', fail_once(self.supervisor._check_jobs)):
+            job = self.run_command('sleep 30', timeout=None, activity_timeout=None)
+        self.assertIsNotNone(job, "run() завис после ошибки в цикле супервизора")
+        self.assertEqual(job.reason, 'error')
+        self.assertTrue(self.supervisor._thread.is_alive())
+        self.assert_recovers()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Тесты ограничителя частоты HostRateLimiter
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+import unittest
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.utils.rate_limiter import HostRateLimiter, parse_retry_after
+
+# 12 ожидающих при 20 запросах в секунду разбираются за ~0.6с - меньше Retry-After
+CONFIG = {'rate': 20, 'burst': 1, 'backoff': 0.5, 'min_rate': 0.2, 'max_rate': 20}
+WAITERS = 12
+THROTTLE_AT = 0.125  # Между отправками по расписанию (каждые 0.05с)
+RETRY_AFTER = 1
+
+class HostRateLimiterTest(unittest.TestCase):
+
+    def assert_retry_after_respected(self, sent):
+        self.assertEqual(len(sent), WAITERS)
+        early = [t for t in sent if t < THROTTLE_AT]
+        late = [t for t in sent if t >= THROTTLE_AT]
+        # До 429 успевают только запросы в пределах исходной скорости
+        self.assertLessEqual(len(early), 3)
+        # Ожидавшие во время 429 не уходят раньше окончания Retry-After, а после блокировки
+        # идут со сниженной скоростью (10 в секунду). Сравнение с расписанием, а не интервалы
+        # между соседними отправками: поток, проснувшийся с опозданием, сокращает интервал до следующего
+        self.assertTrue(all(t >= THROTTLE_AT + RETRY_AFTER + i / 10 - 0.02 for i, t in enumerate(late)), sent)
+
+    def test_async_waiters_honor_late_retry_after(self):
+        limiter = HostRateLimiter(CONFIG)
+        sent = []
+
+        async def main():
+            start = time.monotonic()
+
+            async def waiter():
+                await limiter.wait_async('h')
+                sent.append(time.monotonic() - start)
+
+            tasks = [asyncio.create_task(waiter()) for _ in range(WAITERS)]
+            await asyncio.sleep(THROTTLE_AT)
+            limiter.feedback('h', 429, str(RETRY_AFTER))
+            await asyncio.gather(*tasks)
+
+        asyncio.run(main())
+        self.assert_retry_after_respected(sorted(sent))
+
+    def test_thread_waiters_honor_late_retry_after(self):
+        limiter = HostRateLimiter(CONFIG)
+        sent = []
+        lock = threading.Lock()
+        start = time.monotonic()
+
+        def waiter():
+            limiter.wait('h')
+            with lock:
+                sent.append(time.monotonic() - start)
+
+        threads = [threading.Thread(target=waiter) for _ in range(WAITERS)]
+        for thread in threads:
+            thread.start()
+        time.sleep(THROTTLE_AT)
+        limiter.feedback('h', 429, str(RETRY_AFTER))
+        for thread in threads:
+            thread.join()
+        self.assert_retry_after_respected(sorted(sent))
+
+    def test_hosts_are_independent(self):
+        limiter = HostRateLimiter(CONFIG)
+        limiter.feedback('a', 429, '30')
+        start = time.monotonic()
+        limiter.wait('b')
+        self.assertLess(time.monotonic() - start, 0.05)
+
+    def test_rate_adapts(self):
+        limiter = HostRateLimiter(CONFIG)
+        limiter.feedback('h', 503)
+        self.assertEqual(limiter.rate('h'), 10)
+        limiter.feedback('h', 200)
+        self.assertGreater(limiter.rate('h'), 10)
+
+    def test_spread_rate_caps_each_host(self):
+        limiter = HostRateLimiter(CONFIG)
+        limiter.feedback('slow', 429, '0')
+        limiter.feedback('slow', 429, '0')
+        self.assertEqual(limiter.rate('slow'), 5)
+        # По одной цели на хост: min(скоростей) * число хостов, а не сумма 20 + 20 + 5
+        self.assertEqual(limiter.spread_rate(['a', 'b', 'slow']), 15)
+        # У медленного хоста половина целей: лимит 10, из них 5 в секунду на него
+        self.assertEqual(limiter.spread_rate(['a', 'slow', 'slow', 'b']), 10)
+        self.assertEqual(limiter.spread_rate([]), 0)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('3'), 3.0)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
+
+if __name__ == '__main__':
+    unittest.main()
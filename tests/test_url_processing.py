@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Тесты классификации собранных URL classify_urls
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.recon.url_processing import classify_urls
+from src.utils.url_store import UrlStore, NEW_TAG
+
+URLS = [
+    'http://a.com/app.js',
+    'http://a.com/api/users?id=1',
+    'http://a.com/api/users?id=2',
+    'http://a.com/index.php?page=1',
+]
+
+class ClassifyUrlsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def read(self, name):
+        with open(os.path.join(self.dir, name)) as f:
+            return f.read().split()
+
+    def test_files_and_tags(self):
+        with UrlStore(os.path.join(self.dir, 'urls.db')) as store:
+            store.add_urls(URLS, 'katana')
+            counts = classify_urls(iter(URLS), self.dir, store=store, run_tag=NEW_TAG)
+            self.assertEqual(store.query(tag='js_files'), ['http://a.com/app.js'])
+            self.assertEqual(store.query(tag='api_endpoints'), URLS[1:3])
+            self.assertEqual(store.query(tag=NEW_TAG), URLS)
+        self.assertEqual(counts['js_files.txt'], 1)
+        self.assertEqual(counts['api_endpoints.txt'], 2)
+        # Шаблоны запросов с параметрами дедуплицируются по части до первого '='
+        self.assertEqual(self.read('param_urls.txt'), ['http://a.com/api/users?id=', 'http://a.com/index.php?page='])
+
+    def test_run_tag_requires_store(self):
+        with self.assertRaises(ValueError):
+            classify_urls(iter(URLS), self.dir, run_tag=NEW_TAG)
+        # Без хранилища и метки запуска - только файлы категорий
+        self.assertEqual(classify_urls(iter(URLS), self.dir)['js_files.txt'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Тесты хранилища URL запуска UrlStore
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+# Добавляем путь к корневой директории проекта
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.utils.url_store import UrlStore, parse_url
+
+class UrlStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.store = UrlStore(os.path.join(self.dir, 'urls.db'))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.dir)
+
+    def test_parse_url(self):
+        self.assertEqual(parse_url('https://user@API.example.com:8443/v1/get.PHP?id=1&id=2&q#frag'),
+                         ('api.example.com', '/v1/get.PHP', 'php', ['id', 'q']))
+        self.assertEqual(parse_url('http://[::1]/'), ('::1', '/', '', []))
+
+    def test_param_name_with_comma(self):
+        # Имя 'a,b' не должно распадаться на 'a' и 'b' (повтор 'a' нарушал PRIMARY KEY)
+        url = 'http://x.com/?a=1&a,b=2'
+        self.store.add_urls([url, url], 'wayback')
+        self.assertEqual(self.store.query(param='a,b'), [url])
+        self.assertEqual(self.store.query(param='a'), [url])
+        self.assertEqual(self.store.query(param='b'), [])
+
+    def test_sources_and_order(self):
+        self.store.add_urls(['http://a.com/1?x=1', 'http://a.com/2'], 'wayback')
+        self.store.add_urls(['http://a.com/2', 'http://b.com/3'], 'katana')
+        self.assertEqual(list(self.store.iter_urls()), ['http://a.com/1?x=1', 'http://a.com/2', 'http://b.com/3'])
+        self.assertEqual(self.store.query(host='a.com', with_params=True), ['http://a.com/1?x=1'])
+        sources = self.store._db.execute("SELECT sources FROM urls WHERE url = 'http://a.com/2'").fetchone()[0]
+        self.assertEqual(sources, 'wayback,katana')
+
+    def test_insert_urls_streams_new_urls(self):
+        consumed = []
+
+        def source():
+            for i in range(5):
+                consumed.append(i)
+                yield f'http://a.com/{i % 3}'
+
+        with mock.patch('src.utils.url_store.BATCH_SIZE', 2):
+            stream = self.store.insert_urls(source(), 'katana')
+            # Первый пакет выдается до чтения остальных строк источника
+            self.assertEqual(next(stream), 'http://a.com/0')
+            self.assertEqual(len(consumed), 2)
+            self.assertEqual(list(stream), ['http://a.com/1', 'http://a.com/2'])
+        self.assertEqual(list(self.store.insert_urls(['http://a.com/2', 'http://b.com/'], 'wayback')),
+                         ['http://b.com/'])
+
+if __name__ == '__main__':
+    unittest.main()